@@ -3,30 +3,489 @@ import threading
 import time
 import datetime
 import requests
-import tkinter as tk
-from tkinter import messagebox, ttk
-from PIL import Image, ImageTk
 import io
+import os
+import json
+import argparse
+import abc
+import asyncio
+import email.utils
+import html
+from xml.etree import ElementTree
+import importlib.util
 import webbrowser
-from plyer import notification
-import schedule
 import traceback
+import hashlib
+import hmac
+import secrets
+import base64
+import heapq
+import bisect
+import functools
+import signal
+import sys
+import math
+import re
+import random
+import struct
+import zlib
+import queue
+import itertools
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
 
 NEWSAPI_KEY = "your_api_key"   
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
 DB_PATH = "users.db"
 NOTIFICATION_LIMIT = 4
+HEADLINES_LIMIT = 48            # articles shown in the Latest AI Headlines window
 MORNING_TIME = "09:00"
 EVENING_TIME = "18:00"
+ARTICLE_CACHE_TTL = 15 * 60     # seconds a fetched industry stays fresh
+ARTICLE_CACHE_SIZE = 64
+ARTICLE_RETENTION_DAYS = None   # prune stored articles published longer ago than this (None = keep all)
+ARTICLE_PRUNE_INTERVAL = 3600   # seconds between retention passes
+FETCH_CONCURRENCY = 4           # industries fetched in parallel
+HOST_MIN_INTERVAL = 0.05        # seconds between request starts to the same host
+FETCH_TIMEOUT = (3.05, 12)      # connect, read seconds
+FETCH_RETRIES = 3               # retries after the first attempt on timeouts, 429 and 5xx
+BACKOFF_BASE = 0.5              # seconds; full-jitter exponential backoff between retries
+BACKOFF_MAX = 30                # cap on any single wait, including Retry-After
+BREAKER_FAILURES = 5            # consecutive failures before an endpoint's circuit opens
+BREAKER_RESET = 60              # seconds an open circuit waits before a trial request
+NEWSAPI_DAILY_QUOTA = 100       # requests/day on the NewsAPI developer plan
+FEED_MAX_ITEMS = 1000           # newest RSS/Atom/JSONL items kept per read, shared by every industry
+THUMB_SIZE = (160, 100)
+THUMB_CACHE_DIR = "thumb_cache"
+THUMB_MEMORY_BYTES = 16 * 1024 * 1024   # decoded thumbnails kept in memory
+THUMB_DISK_BYTES = 64 * 1024 * 1024     # encoded thumbnails kept on disk
+THUMB_REVALIDATE_AFTER = 24 * 3600      # seconds before a disk entry is revalidated with the server
+IMAGE_WORKERS = 4                       # concurrent thumbnail downloads
+HEADLINE_ROW_HEIGHT = 176               # px per card slot in the Latest AI Headlines window
+HEADLINE_OVERSCAN = 2                   # cards kept materialized above/below the viewport
+TK_TICK_MS = 16                         # how often the Tk thread picks up background results
+TK_TICK_BUDGET_MS = 8                   # max Tk-thread time per tick spent on those results
+USER_SYNC_INTERVAL = 5 * 60             # seconds between user list reloads in `serve` mode
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16                          # 16 bands x 4 rows: candidates from ~0.5 Jaccard up
+NEAR_DUP_THRESHOLD = 0.5                # estimated Jaccard at which two stories are the same
+SEARCH_PAGE_SIZE = 20                   # results per page in the dashboard search
+SEARCH_CANDIDATES = 10000               # newest matches ranked by BM25 per search
+SEARCH_TITLE_WEIGHT = 4.0               # BM25 weight of a title match relative to the description
+SEARCH_PERIODS = {"Any time": None, "Past day": 1, "Past week": 7, "Past month": 31, "Past year": 365}
+TOPK_CANDIDATES = 10                    # with a digest scorer, newest limit * this articles are scored
+DIGEST_SCORER = None                    # None = newest first, or e.g. make_scorer(source_weights={"Reuters": 1.5})
+PASSWORD_KDF = "scrypt"                 # or "pbkdf2_sha256"
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1    # ~16 MiB and a few tens of ms per hash
+PBKDF2_ITERATIONS = 600_000
+PASSWORD_MIGRATE_BATCH = 50             # plaintext passwords rehashed per transaction at startup
+SESSION_TTL = 12 * 3600                 # seconds a login session token stays valid
+SESSION_CACHE_SIZE = 256                # live session tokens kept; the oldest are evicted
+NOTIFY_WORKERS = 1                      # delivery threads per notification sink
+NOTIFY_QUEUE_SIZE = 10000               # pending notifications per sink before new ones are dropped
+NOTIFY_RATE = 5                         # deliveries/second per rate-limited sink, i.e. the desktop (None = unlimited)
+NOTIFY_BURST = 20
+NOTIFY_DROP_LOG_INTERVAL = 60           # seconds between log lines about a sink's dropped notifications
+METRICS_ENABLED = False                 # `serve --metrics-port/--metrics-dump` switch this on
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)   # histogram bounds, seconds
+METRICS_DUMP_INTERVAL = 60              # seconds between JSON metrics dumps
+PROFILE_PATH = "ai_trends.prof"         # where a toggled cProfile run is written (pstats format)
+SUMMARY_BACKEND = "auto"                # "openai", "extractive", "off"; auto = openai if installed and OPENAI_API_KEY is set
+SUMMARY_MODEL = "gpt-4o-mini"
+SUMMARY_BATCH = 8                       # articles summarized per backend call
+SUMMARY_BATCH_WAIT = 0.2                # seconds a partial batch waits for more articles
+SUMMARY_TIMEOUT = 20                    # seconds a backend call may take before its batch is summarized locally
+SUMMARY_MAX_CHARS = 280
+SUMMARY_QUEUE_SIZE = 5000               # articles waiting for a summary before new ones are dropped
+SUMMARY_CACHE_SIZE = 4096               # summaries kept in memory for digest building
 
 try:
-    import openai
-    OPENAI_AVAILABLE = True
+    import numpy as np
+    NUMPY_AVAILABLE = True
 except Exception:
-    OPENAI_AVAILABLE = False
+    NUMPY_AVAILABLE = False
+
+# probe only: importing openai is slow and the notifier itself does not need it
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+
+# GUI stack, imported by _load_gui() so the headless `serve` mode never loads Tk/PIL
+tk = messagebox = ttk = None
+Image = ImageTk = None
+
+
+def _load_gui():
+    global tk, messagebox, ttk, Image, ImageTk
+    import tkinter as tk
+    from tkinter import messagebox, ttk
+    from PIL import Image, ImageTk
+
+
+# Metrics & profiling 
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            self.metrics.inc(f"{self.name}_errors", **self.labels)
+        return False
+
+
+def _metric_key(name, labels):
+    # label values are stored as strings so series keys always sort (status=503 vs status="Timeout")
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _prom_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+
+class Metrics:
+    """
+    In-process counters, latency histograms and read-on-export gauges for the
+    fetch -> rank -> notify pipeline, exported as Prometheus text or JSON.
+    While `enabled` is False every recording call returns after one attribute check.
+    Histogram `name` "fetch" is exported as <prefix>fetch_seconds, counter "fetch_errors"
+    as <prefix>fetch_errors_total.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, buckets=METRICS_BUCKETS, prefix="ai_trends_"):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._counters = {}         # (name, labels) -> value
+        self._histograms = {}       # (name, labels) -> [per-bucket counts..., overflow, sum]
+        self._gauges = {}           # name -> zero-argument callable
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        key = _metric_key(name, labels)
+        with self._lock:
+            h = self._histograms.get(key)
+            if h is None:
+                h = self._histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            h[bisect.bisect_left(self.buckets, seconds)] += 1
+            h[-1] += seconds
+
+    def timer(self, name, **labels):
+        """Context manager observing the block's duration (and counting it as an error if it raises)."""
+        return _Timer(self, name, labels) if self.enabled else _NULL_TIMER
+
+    def timed(self, name, **labels):
+        """Decorator form of `timer`."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self, name, labels):
+                    return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def gauge(self, name, fn):
+        """Register `fn()` to be read at export time as gauge `name`."""
+        self._gauges[name] = fn
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _read_gauges(self):
+        values = {}
+        for name, fn in list(self._gauges.items()):
+            try:
+                values[name] = float(fn())
+            except Exception:
+                pass
+        return values
+
+    def _quantile(self, h, q):
+        count = sum(h[:-1])
+        rank = q * count
+        seen = 0
+        for bound, n in zip(self.buckets, h):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        """Everything recorded so far as a JSON-serialisable dict."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+        name = lambda key: key[0] + _prom_labels(key[1])
+        out = {"time": time.time(), "counters": {}, "histograms": {}, "gauges": self._read_gauges()}
+        for key, value in sorted(counters.items()):
+            out["counters"][name(key)] = value
+        for key, h in sorted(histograms.items()):
+            count = sum(h[:-1])
+            out["histograms"][name(key)] = {
+                "count": count,
+                "sum": h[-1],
+                "avg": h[-1] / count if count else 0.0,
+                "p50": self._quantile(h, 0.5),
+                "p95": self._quantile(h, 0.95),
+            }
+        return out
+
+    def prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+        lines = []
+        typed = set()
+        for (name, labels), value in sorted(counters.items()):
+            metric = f"{self.prefix}{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_prom_labels(labels)} {value}")
+        for (name, labels), h in sorted(histograms.items()):
+            metric = f"{self.prefix}{name}_seconds"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(self.buckets, h):
+                cumulative += n
+                lines.append(f"{metric}_bucket{_prom_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{metric}_bucket{_prom_labels(labels, [('le', '+Inf')])} {sum(h[:-1])}")
+            lines.append(f"{metric}_sum{_prom_labels(labels)} {h[-1]}")
+            lines.append(f"{metric}_count{_prom_labels(labels)} {sum(h[:-1])}")
+        for name, value in sorted(self._read_gauges().items()):
+            lines.append(f"# TYPE {self.prefix}{name} gauge")
+            lines.append(f"{self.prefix}{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class Profiler:
+    """
+    cProfile that can be switched on and off in a running process (SIGUSR1, or
+    POST /profile on the metrics server). Before Python 3.12 cProfile only sees the
+    thread that enables it, so pipeline work runs inside `section()`: while profiling
+    is on each section gets its own profiler, and the merged stats are written to `path`
+    when profiling stops. From 3.12 a cProfile sees every thread but only one may be
+    enabled at a time, so start() enables a single one and section() does nothing.
+    """
+
+    def __init__(self, path=PROFILE_PATH, process_wide=None):
+        self.path = path
+        self.process_wide = sys.version_info >= (3, 12) if process_wide is None else process_wide
+        self.active = False
+        self._stats = None
+        self._prof = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.active:
+                return
+            self._stats = None
+            if self.process_wide:
+                import cProfile
+                prof = cProfile.Profile()
+                try:
+                    prof.enable()
+                except ValueError as e:
+                    # another profiler (a debugger, coverage) already holds the hook
+                    print(f"Profiling unavailable: {e}")
+                    return
+                self._prof = prof
+            self.active = True
+
+    def stop(self):
+        import pstats
+        with self._lock:
+            self.active = False
+            prof, self._prof = self._prof, None
+            stats, self._stats = self._stats, None
+        if prof is not None:
+            prof.disable()
+            try:
+                stats = pstats.Stats(prof)
+            except TypeError:   # nothing was recorded
+                stats = None
+        if stats is not None:
+            stats.dump_stats(self.path)
+            print(f"Profile written to {self.path}")
+        return stats
+
+    def toggle(self):
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+        return self.active
+
+    def section(self):
+        """Context manager profiling the block while profiling is on (a no-op otherwise)."""
+        if not self.active or self.process_wide or getattr(self._local, "busy", False):
+            return _NULL_TIMER
+        return self._profiled()
+
+    @contextmanager
+    def _profiled(self):
+        import cProfile
+        import pstats
+        prof = cProfile.Profile()
+        self._local.busy = True
+        try:
+            try:
+                prof.enable()
+            except ValueError:
+                # another profiler holds the hook: run the block unprofiled
+                prof = None
+            yield
+        finally:
+            self._local.busy = False
+            if prof is not None:
+                prof.disable()
+            with self._lock:
+                if self.active and prof is not None:
+                    try:
+                        if self._stats is None:
+                            self._stats = pstats.Stats(prof)
+                        else:
+                            self._stats.add(prof)
+                    except TypeError:   # nothing was recorded
+                        pass
+
+
+PROFILER = Profiler()
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Serve GET /metrics (Prometheus text) and /metrics.json, plus POST /profile to toggle
+    PROFILER, from a daemon thread. Returns the server; call shutdown() to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body, content_type="text/plain; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == "/metrics":
+                self._reply(200, METRICS.prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+            elif path == "/metrics.json":
+                self._reply(200, json.dumps(METRICS.snapshot()), "application/json")
+            else:
+                self._reply(404, "not found\n")
+
+        def do_POST(self):
+            if urlsplit(self.path).path != "/profile":
+                self._reply(404, "not found\n")
+                return
+            self._reply(200, f"profiling {'on' if PROFILER.toggle() else 'off'}\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def start_metrics_dump(path, interval=METRICS_DUMP_INTERVAL):
+    """Write METRICS.snapshot() to `path` as JSON every `interval` seconds. Returns an Event that stops it."""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            try:
+                tmp = f"{path}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(METRICS.snapshot(), f, indent=1)
+                os.replace(tmp, path)
+            except OSError as e:
+                print("Metrics dump failed:", e)
+
+    threading.Thread(target=loop, name="metrics-dump", daemon=True).start()
+    return stop
+
+
+# Data access 
+_db_local = threading.local()
+
+
+def get_conn():
+    """
+    Connection to DB_PATH for the calling thread. Each thread keeps its own connection
+    (sqlite3 connections are not shareable across threads) so calls reuse it and its
+    prepared-statement cache instead of reconnecting. Opened in WAL mode so readers do
+    not block the writer.
+    """
+    conns = getattr(_db_local, "conns", None)
+    if conns is None:
+        conns = _db_local.conns = {}
+    conn = conns.get(DB_PATH)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=30, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conns[DB_PATH] = conn
+    return conn
+
+
+def close_conn():
+    """Close the calling thread's connections (e.g. before a worker thread exits)."""
+    for conn in getattr(_db_local, "conns", {}).values():
+        conn.close()
+    _db_local.conns = {}
 
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_conn()
     c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -40,162 +499,2719 @@ def init_db():
             industries TEXT
         )
     """)
+    c.execute(_ARTICLES_DDL)
+    if "signature" not in {row[1] for row in c.execute("PRAGMA table_info(articles)")}:
+        c.execute("ALTER TABLE articles ADD COLUMN signature BLOB")
+    _migrate_article_ids(c)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_industry_published ON articles (industry, published_at DESC)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at DESC)")
+    # rows stored before unparseable dates were blanked (normalized ones start with a digit)
+    c.execute("UPDATE articles SET published_at='' WHERE published_at >= ':' OR (published_at < '0' AND published_at != '')")
+    _init_search_index(c)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_state (
+            source TEXT NOT NULL,
+            industry TEXT NOT NULL,
+            high_water TEXT,
+            PRIMARY KEY (source, industry)
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS user_industries (
+            username TEXT NOT NULL,
+            industry TEXT NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (username, industry)
+        ) WITHOUT ROWID
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_user_industries_industry ON user_industries (industry, username)")
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS summaries (
+            content_hash TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            backend TEXT NOT NULL,
+            created_at REAL NOT NULL
+        ) WITHOUT ROWID
+    """)
+    _migrate_preferences(c)
     conn.commit()
-    conn.close()
 
-def create_user(username, password):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    try:
-        c.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return False
-    finally:
-        conn.close()
+# `id` is what articles_fts points at: an INTEGER PRIMARY KEY is never renumbered (e.g. by VACUUM)
+_ARTICLES_DDL = """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY,
+            url_hash TEXT NOT NULL,
+            industry TEXT NOT NULL,
+            url TEXT,
+            title TEXT,
+            description TEXT,
+            url_to_image TEXT,
+            source TEXT,
+            published_at TEXT,
+            signature BLOB,
+            UNIQUE (url_hash, industry)
+        )
+"""
+
+
+def _migrate_article_ids(c):
+    """Rebuild an articles table from before the `id` key, in rowid (ingestion) order; the search index is rebuilt."""
+    if "id" in {row[1] for row in c.execute("PRAGMA table_info(articles)")}:
+        return
+    c.executescript(f"""
+        BEGIN;
+        DROP TRIGGER IF EXISTS articles_fts_insert;
+        DROP TRIGGER IF EXISTS articles_fts_delete;
+        DROP TRIGGER IF EXISTS articles_fts_update;
+        DROP TABLE IF EXISTS articles_fts;
+        ALTER TABLE articles RENAME TO articles_old;
+        {_ARTICLES_DDL};
+        INSERT INTO articles (url_hash, industry, url, title, description, url_to_image, source, published_at, signature)
+        SELECT url_hash, industry, url, title, description, url_to_image, source, published_at, signature
+        FROM articles_old ORDER BY rowid;
+        DROP TABLE articles_old;
+        COMMIT;
+    """)
+
+
+def _init_search_index(c):
+    """
+    FTS5 index over article titles and descriptions, kept in step with `articles` by
+    triggers so every store_articles upsert is indexed incrementally. An existing
+    articles table is indexed once when the index is first created.
+    """
+    exists = c.execute("SELECT 1 FROM sqlite_master WHERE name='articles_fts'").fetchone()
+    c.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, description, content='articles', content_rowid='id', tokenize='porter unicode61'
+        )
+    """)
+    c.executescript("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, description ON articles
+        WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END;
+    """)
+    if not exists:
+        c.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+
+
+def _migrate_preferences(c):
+    """Copy comma-joined preferences.industries into user_industries for users not migrated yet."""
+    rows = c.execute("""
+        SELECT username, industries FROM preferences
+        WHERE industries != '' AND username NOT IN (SELECT username FROM user_industries)
+    """).fetchall()
+    c.executemany(
+        "INSERT OR IGNORE INTO user_industries (username, industry, position) VALUES (?, ?, ?)",
+        [(u, ind, pos) for u, csv in rows for pos, ind in enumerate(csv.split(",")) if ind],
+    )
+
+_KDF_PARAMS = {"scrypt": 3, "pbkdf2_sha256": 1}     # cost fields stored by each KDF
+
+
+def hash_password(password, kdf=None):
+    """
+    Salted hash of `password` as a self-describing string:
+    scrypt$<n>$<r>$<p>$<salt>$<hash> or pbkdf2_sha256$<iterations>$<salt>$<hash>.
+    `kdf` defaults to PASSWORD_KDF; the cost comes from SCRYPT_N/R/P or PBKDF2_ITERATIONS.
+    """
+    kdf = kdf or PASSWORD_KDF
+    salt = os.urandom(16)
+    if kdf == "scrypt":
+        params = (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    elif kdf == "pbkdf2_sha256":
+        params = (PBKDF2_ITERATIONS,)
+    else:
+        raise ValueError(f"unknown password KDF {kdf!r}")
+    digest = _derive(kdf, password, salt, params)
+    b64 = lambda b: base64.b64encode(b).decode("ascii")
+    return "$".join([kdf, *map(str, params), b64(salt), b64(digest)])
+
+
+def _derive(kdf, password, salt, params):
+    if kdf == "scrypt":
+        n, r, p = params
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r * p + 2 ** 20, dklen=32)
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, params[0], dklen=32)
+
+
+def verify_password(password, stored):
+    """
+    Check `password` against a stored value: (matches, needs_rehash). Plaintext rows
+    written by older builds still verify, and always need a rehash; so do hashes made
+    with a different KDF or cost than the current settings.
+    """
+    parsed = _parse_hash(stored)
+    if parsed is None:
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8")), True
+    kdf, params, salt, digest = parsed
+    ok = hmac.compare_digest(_derive(kdf, password, salt, params), digest)
+    current = (SCRYPT_N, SCRYPT_R, SCRYPT_P) if kdf == "scrypt" else (PBKDF2_ITERATIONS,)
+    return ok, kdf != PASSWORD_KDF or params != current
+
+
+def _parse_hash(stored):
+    """(kdf, params, salt, digest) of a hash_password string, or None for anything else (plaintext)."""
+    kdf, _, rest = stored.partition("$")
+    fields = rest.split("$")
+    if kdf not in _KDF_PARAMS or len(fields) != _KDF_PARAMS[kdf] + 2:
+        return None
+    try:
+        params = tuple(int(f) for f in fields[:-2])
+        salt, digest = (base64.b64decode(f, validate=True) for f in fields[-2:])
+    except ValueError:
+        return None
+    if min(params) < 1 or (kdf == "scrypt" and (params[0] < 2 or params[0] & (params[0] - 1))):
+        return None
+    return kdf, params, salt, digest
+
+
+_DUMMY_HASHES = {}
+
+
+def _dummy_hash():
+    # verified against for unknown users, so they take as long as a wrong password
+    settings = (PASSWORD_KDF, SCRYPT_N, SCRYPT_R, SCRYPT_P, PBKDF2_ITERATIONS)
+    if settings not in _DUMMY_HASHES:
+        _DUMMY_HASHES[settings] = hash_password(secrets.token_hex(8))
+    return _DUMMY_HASHES[settings]
+
+
+@METRICS.timed("auth", op="create_user")
+def create_user(username, password):
+    hashed = hash_password(password)
+    conn = get_conn()
+    try:
+        with conn:
+            conn.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, hashed))
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+@METRICS.timed("auth", op="migrate_passwords")
+def migrate_plaintext_passwords(batch=PASSWORD_MIGRATE_BATCH):
+    """
+    Replace plaintext passwords left by older builds with salted hashes; returns how
+    many were replaced. Runs the KDF once per row, so call it off the Tk thread. Hashes
+    are computed outside the write transaction, `batch` rows at a time, and a row that
+    changed meanwhile (e.g. rehashed by a login) is left alone.
+    """
+    conn = get_conn()
+    rows = [(u, pw) for u, pw in conn.execute("SELECT username, password FROM users") if _parse_hash(pw) is None]
+    for i in range(0, len(rows), batch):
+        updates = [(hash_password(pw), u, pw) for u, pw in rows[i:i + batch]]
+        with conn:
+            conn.executemany("UPDATE users SET password=? WHERE username=? AND password=?", updates)
+    return len(rows)
+
+
+@METRICS.timed("auth", op="validate_user")
+def validate_user(username, password):
+    """
+    Check a password (runs the KDF: call it off the Tk thread). Outdated hashes, and
+    plaintext rows migrate_plaintext_passwords has not reached yet, are rehashed.
+    """
+    row = get_conn().execute("SELECT password FROM users WHERE username=?", (username,)).fetchone()
+    if row is None:
+        verify_password(password, _dummy_hash())
+        return False
+    ok, needs_rehash = verify_password(password, row[0])
+    if ok and needs_rehash:
+        conn = get_conn()
+        with conn:
+            conn.execute("UPDATE users SET password=? WHERE username=? AND password=?",
+                         (hash_password(password), username, row[0]))
+    return ok
+
+
+class SessionCache:
+    """
+    Recently issued login session tokens: token -> username, valid for `ttl` seconds,
+    at most `size` of them (least recently used evicted). Checking a token costs a dict
+    lookup, so repeated operations for a logged-in user never rerun the password KDF.
+    """
+
+    def __init__(self, ttl=SESSION_TTL, size=SESSION_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._tokens = OrderedDict()    # token -> (username, expires_at)
+        self._lock = threading.Lock()
+
+    def issue(self, username):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._tokens[token] = (username, time.monotonic() + self.ttl)
+            while len(self._tokens) > self.size:
+                self._tokens.popitem(last=False)
+        return token
+
+    def user(self, token):
+        """Username for a live token, else None."""
+        with self._lock:
+            entry = self._tokens.get(token) if token else None
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._tokens[token]
+                return None
+            self._tokens.move_to_end(token)
+            return entry[0]
+
+    def revoke(self, token):
+        with self._lock:
+            self._tokens.pop(token, None)
+
+    def revoke_user(self, username):
+        with self._lock:
+            for token in [t for t, (u, _) in self._tokens.items() if u == username]:
+                del self._tokens[token]
+
+
+SESSIONS = SessionCache()
+
+
+def login(username, password):
+    """Session token for valid credentials (see SESSIONS), else None."""
+    return SESSIONS.issue(username) if validate_user(username, password) else None
+
+@METRICS.timed("db", op="save_preferences")
+def save_preferences(username, industries_list):
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM user_industries WHERE username=?", (username,))
+        conn.executemany("INSERT OR IGNORE INTO user_industries (username, industry, position) VALUES (?, ?, ?)",
+                         [(username, ind, pos) for pos, ind in enumerate(industries_list)])
+        # legacy comma-joined column, kept in sync for older builds sharing users.db
+        conn.execute("REPLACE INTO preferences (username, industries) VALUES (?, ?)", (username, ",".join(industries_list)))
+
+@METRICS.timed("db", op="industries_for")
+def industries_for(username):
+    rows = get_conn().execute(
+        "SELECT industry FROM user_industries WHERE username=? ORDER BY position", (username,)).fetchall()
+    return [r[0] for r in rows]
+
+@METRICS.timed("db", op="subscribers_for")
+def subscribers_for(industry):
+    rows = get_conn().execute(
+        "SELECT username FROM user_industries WHERE industry=? ORDER BY username", (industry,)).fetchall()
+    return [r[0] for r in rows]
+
+def get_preferences(username):
+    return industries_for(username)
+
+@METRICS.timed("db", op="subscribed_users")
+def subscribed_users():
+    rows = get_conn().execute("SELECT DISTINCT username FROM user_industries ORDER BY username").fetchall()
+    return [r[0] for r in rows]
+
+SQL_VARIABLE_CHUNK = 500
+
+@METRICS.timed("db", op="get_preferences_many")
+def get_preferences_many(usernames):
+    """Industries for many users in one query per chunk: {username: [industries]}."""
+    usernames = list(usernames)
+    prefs = {u: [] for u in usernames}
+    conn = get_conn()
+    for i in range(0, len(usernames), SQL_VARIABLE_CHUNK):
+        chunk = usernames[i:i + SQL_VARIABLE_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        for username, industry in conn.execute(
+                f"SELECT username, industry FROM user_industries WHERE username IN ({marks}) ORDER BY username, position",
+                chunk):
+            prefs[username].append(industry)
+    return prefs
+
+# Near-duplicate detection 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MINHASH_PRIME = 4294967311     # smallest prime above 2**32
+_minhash_rng = random.Random(20250101)
+_MINHASH_A = [_minhash_rng.randrange(1, 2**31) for _ in range(MINHASH_PERMUTATIONS)]
+_MINHASH_B = [_minhash_rng.randrange(0, 2**31) for _ in range(MINHASH_PERMUTATIONS)]
+if NUMPY_AVAILABLE:
+    _MINHASH_A_NP = np.array(_MINHASH_A, dtype=np.uint64)[:, None]
+    _MINHASH_B_NP = np.array(_MINHASH_B, dtype=np.uint64)[:, None]
+
+
+def _shingles(text):
+    words = _TOKEN_RE.findall(text.lower())
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash_signature(text):
+    """
+    MinHash signature (MINHASH_PERMUTATIONS little-endian uint32s, as bytes) of the
+    word-bigram set of `text`, or None if it has no words. Uses crc32 so signatures are
+    stable across processes and can be stored with the article.
+    """
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in _shingles(text)]
+    if not hashes:
+        return None
+    if NUMPY_AVAILABLE:
+        h = np.array(hashes, dtype=np.uint64)[None, :]
+        sig = ((_MINHASH_A_NP * h + _MINHASH_B_NP) % _MINHASH_PRIME).min(axis=1)
+        return sig.astype("<u4").tobytes()
+    sig = [min((a * x + b) % _MINHASH_PRIME for x in hashes) for a, b in zip(_MINHASH_A, _MINHASH_B)]
+    return struct.pack(f"<{MINHASH_PERMUTATIONS}I", *sig)
+
+
+def article_signature(article):
+    # same text store_articles keeps in the description column, so stored and recomputed signatures agree
+    text = article.get("description") or article.get("content") or ""
+    return minhash_signature(f"{article.get('title') or ''} {text}")
+
+
+def signature_similarity(sig1, sig2):
+    """Estimated Jaccard similarity: fraction of matching MinHash slots."""
+    if NUMPY_AVAILABLE:
+        return float(np.count_nonzero(np.frombuffer(sig1, "<u4") == np.frombuffer(sig2, "<u4"))) / MINHASH_PERMUTATIONS
+    return sum(x == y for x, y in zip(struct.unpack(f"<{MINHASH_PERMUTATIONS}I", sig1),
+                                     struct.unpack(f"<{MINHASH_PERMUTATIONS}I", sig2))) / MINHASH_PERMUTATIONS
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures. Signatures are split into LSH_BANDS bands;
+    articles sharing any band are candidates, and a candidate whose estimated Jaccard
+    similarity reaches `threshold` is a near duplicate.
+    """
+
+    def __init__(self, threshold=NEAR_DUP_THRESHOLD):
+        self.threshold = threshold
+        self._band_bytes = len(_MINHASH_A) * 4 // LSH_BANDS
+        self._buckets = {}      # (band, band bytes) -> [keys]
+        self._sigs = {}
+
+    def find(self, sig):
+        """Key of an indexed near duplicate of `sig`, or None."""
+        if sig is None:
+            return None
+        checked = set()
+        for band in range(LSH_BANDS):
+            chunk = sig[band * self._band_bytes:(band + 1) * self._band_bytes]
+            for key in self._buckets.get((band, chunk), ()):
+                if key not in checked:
+                    checked.add(key)
+                    if signature_similarity(sig, self._sigs[key]) >= self.threshold:
+                        return key
+        return None
+
+    def add(self, key, sig):
+        if sig is None:
+            return
+        self._sigs[key] = sig
+        for band in range(LSH_BANDS):
+            chunk = sig[band * self._band_bytes:(band + 1) * self._band_bytes]
+            self._buckets.setdefault((band, chunk), []).append(key)
+
+    def find_or_add(self, key, sig):
+        """Representative key if `sig` is a near duplicate, else index it under `key` and return None."""
+        rep = self.find(sig)
+        if rep is None:
+            self.add(key, sig)
+        return rep
+
+
+def cluster_articles(articles):
+    """
+    Group near-duplicate articles. Returns a list of clusters (lists of articles), each
+    led by its first article in input order, which is the one to keep.
+    """
+    index = NearDuplicateIndex()
+    clusters = []
+    for art in articles:
+        rep = index.find_or_add(len(clusters), article_signature(art))
+        if rep is None:
+            clusters.append([art])
+        else:
+            clusters[rep].append(art)
+    return clusters
+
+
+# Article store 
+def _url_hash(article):
+    key = article.get("url") or f"{article.get('title')}|{article.get('publishedAt')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _normalize_published(value):
+    """
+    Store publishedAt as UTC 'YYYY-MM-DDTHH:MM:SSZ' so string order is time order.
+    Unparseable values become "", which sorts oldest just like their _EPOCH stream key.
+    """
+    ts = parse_published(value)
+    if ts == _EPOCH:
+        return ""
+    return ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@METRICS.timed("db", op="store_articles")
+def store_articles(industry, articles):
+    """Upsert fetched articles for `industry` in a single transaction."""
+    rows = [
+        (
+            _url_hash(a),
+            industry,
+            a.get("url"),
+            a.get("title"),
+            a.get("description") or a.get("content"),
+            a.get("urlToImage"),
+            (a.get("source") or {}).get("name"),
+            _normalize_published(a.get("publishedAt")),
+            article_signature(a),
+        )
+        for a in articles
+    ]
+    if not rows:
+        return 0
+    conn = get_conn()
+    with conn:
+        conn.executemany("""
+            INSERT INTO articles (url_hash, industry, url, title, description, url_to_image, source, published_at, signature)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (url_hash, industry) DO UPDATE SET
+                url=excluded.url, title=excluded.title, description=excluded.description,
+                url_to_image=excluded.url_to_image, source=excluded.source, published_at=excluded.published_at,
+                signature=excluded.signature
+        """, rows)
+    return len(rows)
+
+
+@METRICS.timed("db", op="high_water_mark")
+def high_water_mark(source, industry):
+    """publishedAt of the newest article ingested from `source` for `industry`, or None."""
+    row = get_conn().execute(
+        "SELECT high_water FROM ingest_state WHERE source=? AND industry=?", (source, industry)).fetchone()
+    return row[0] if row and row[0] else None
+
+
+@METRICS.timed("db", op="update_high_water_mark")
+def update_high_water_mark(source, industry, articles):
+    newest = max((_normalize_published(a.get("publishedAt")) for a in articles), default="")
+    if not newest:
+        return
+    conn = get_conn()
+    with conn:
+        conn.execute("""
+            INSERT INTO ingest_state (source, industry, high_water) VALUES (?, ?, ?)
+            ON CONFLICT (source, industry) DO UPDATE SET high_water=MAX(high_water, excluded.high_water)
+        """, (source, industry, newest))
+
+
+@METRICS.timed("db", op="prune_articles")
+def prune_articles(max_age_days, now=None):
+    """
+    Delete stored articles published more than `max_age_days` ago, and summaries made
+    more than `max_age_days` ago; returns the number of articles deleted.
+    Undated articles are kept: their age is unknown.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    oldest = now - datetime.timedelta(days=max_age_days)
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM summaries WHERE created_at < ?", (oldest.timestamp(),))
+        return conn.execute("DELETE FROM articles WHERE published_at < ? AND published_at != ''",
+                            (oldest.strftime("%Y-%m-%dT%H:%M:%SZ"),)).rowcount
+
+
+_last_prune = None
+_prune_lock = threading.Lock()
+
+
+def maybe_prune_articles():
+    """prune_articles(ARTICLE_RETENTION_DAYS) at most once per ARTICLE_PRUNE_INTERVAL, if retention is set."""
+    global _last_prune
+    if ARTICLE_RETENTION_DAYS is None:
+        return 0
+    with _prune_lock:
+        if _last_prune is not None and time.monotonic() - _last_prune < ARTICLE_PRUNE_INTERVAL:
+            return 0
+        _last_prune = time.monotonic()
+    return prune_articles(ARTICLE_RETENTION_DAYS)
+
+
+_EPOCH = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+
+def parse_published(value):
+    """
+    publishedAt (an ISO string or a datetime) as an aware UTC datetime; naive values are
+    taken as local time, junk sorts oldest.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.astimezone(datetime.timezone.utc)
+    if not value:
+        return _EPOCH
+    try:
+        dt = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return _EPOCH
+    return dt.astimezone(datetime.timezone.utc)
+
+
+def _industry_stream(conn, industry):
+    # index range scan in (industry, published_at DESC) order: no sort, rows read lazily
+    cur = conn.execute("""
+        SELECT url_hash, industry, url, title, description, url_to_image, source, published_at, signature
+        FROM articles WHERE industry=? ORDER BY published_at DESC
+    """, (industry,))
+    for row in cur:
+        yield parse_published(row[7]), row
+
+
+def iter_stored_articles(industries):
+    """
+    Stored articles for `industries`, newest first, as (article, published datetime).
+    One index-ordered stream per industry is merged lazily with heapq.merge, so only as
+    many rows are read as the caller consumes. A URL stored under several industries is
+    yielded once, tagged with the earliest of them in `industries`, and near-duplicate
+    stories (the same wire story from other outlets) are dropped in favour of the newest.
+    """
+    order = {ind: pos for pos, ind in enumerate(industries)}
+    conn = get_conn()
+    streams = [_industry_stream(conn, ind) for ind in industries]
+    seen = {}
+    near_dups = NearDuplicateIndex()
+    for ts, (url_hash, industry, url, title, desc, image, source, published, signature) in heapq.merge(
+            *streams, key=lambda item: item[0], reverse=True):
+        prev = seen.get(url_hash)
+        if prev is not None:
+            if order[industry] < order[prev["_industry"]]:
+                prev["_industry"] = industry
+            continue
+        if signature is None:
+            signature = article_signature({"title": title, "description": desc})
+        if near_dups.find_or_add(url_hash, signature) is not None:
+            continue
+        art = seen[url_hash] = {
+            "title": title,
+            "description": desc,
+            "url": url,
+            "urlToImage": image,
+            "source": {"name": source},
+            "publishedAt": published,
+            "_industry": industry,
+        }
+        yield art, ts
+
+
+_SEARCH_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text):
+    """
+    Free text typed by a user as an FTS5 MATCH expression: every word must match
+    (quoted, so FTS operators and punctuation are taken literally) and a last word of
+    three or more letters also matches as a prefix, for search-as-you-type.
+    Returns None if there are no words.
+    """
+    words = _SEARCH_TOKEN_RE.findall(text or "")
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    if len(words[-1]) >= 3:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+@METRICS.timed("search")
+def search_articles(text, industries=None, since=None, until=None, page=0, page_size=SEARCH_PAGE_SIZE):
+    """
+    Stored articles matching `text`, best BM25 match first (title hits weigh
+    SEARCH_TITLE_WEIGHT times description hits), optionally limited to `industries`
+    and to publishedAt in [since, until) (ISO strings or datetimes).
+    Returns (articles for page number `page`, whether there is a next page). A URL
+    stored under several industries is returned once.
+    Like top_articles, only the newest SEARCH_CANDIDATES matching rows (ids grow with
+    ingestion) are ranked, which keeps very common words from scoring the whole store.
+    The window depends only on the query and filters, so every page comes from the
+    same ranking.
+    """
+    match = fts_query(text)
+    if match is None:
+        return [], False
+    conn = get_conn()
+    where, params = _search_filters(match, industries, since, until)
+    floor = conn.execute(f"""
+        SELECT articles_fts.rowid FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+        WHERE {' AND '.join(where)} ORDER BY articles_fts.rowid DESC LIMIT 1 OFFSET ?
+    """, params + [SEARCH_CANDIDATES - 1]).fetchone()
+    if floor is not None:
+        where.append("articles_fts.rowid >= ?")
+        params.append(floor[0])
+    return _search_page(conn, where, params, page, page_size)
+
+
+def _search_filters(match, industries, since, until):
+    where, params = ["articles_fts MATCH ?"], [match]
+    if industries:
+        where.append(f"a.industry IN ({','.join('?' * len(industries))})")
+        params.extend(industries)
+    if since:
+        where.append("a.published_at >= ?")
+        params.append(_normalize_published(since))
+    if until:
+        where.append("a.published_at < ?")
+        params.append(_normalize_published(until))
+    return where, params
+
+
+def _search_page(conn, where, params, page, page_size):
+    cur = conn.execute(f"""
+        SELECT a.url_hash, a.industry, a.url, a.title, a.description, a.url_to_image, a.source, a.published_at
+        FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+        WHERE {' AND '.join(where)}
+        ORDER BY bm25(articles_fts, {SEARCH_TITLE_WEIGHT}, 1.0)
+    """, params)
+    skip, want = page * page_size, page_size + 1
+    seen = set()
+    results = []
+    for url_hash, industry, url, title, desc, image, source, published in cur:
+        if url_hash in seen:
+            continue
+        seen.add(url_hash)
+        if skip:
+            skip -= 1
+            continue
+        results.append({
+            "title": title,
+            "description": desc,
+            "url": url,
+            "urlToImage": image,
+            "source": {"name": source},
+            "publishedAt": published,
+            "_industry": industry,
+        })
+        if len(results) == want:
+            break
+    return results[:page_size], len(results) > page_size
+
+
+def make_scorer(half_life_hours=12.0, source_weights=None, industry_weights=None):
+    """
+    Digest scoring function: exponential recency decay (the score halves every
+    `half_life_hours`) times optional per-source and per-industry weights (default 1.0).
+    """
+    source_weights = source_weights or {}
+    industry_weights = industry_weights or {}
+    decay = math.log(2) / (half_life_hours * 3600)
+
+    def score(article, published, now):
+        age = max((now - published).total_seconds(), 0.0)
+        return (math.exp(-decay * age)
+                * source_weights.get((article.get("source") or {}).get("name"), 1.0)
+                * industry_weights.get(article.get("_industry"), 1.0))
+    return score
+
+
+def select_top(items, k, score, now=None):
+    """Best `k` of (article, published) pairs by `score`, best first, with a bounded min-heap."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    heap = []
+    for seq, (art, ts) in enumerate(items):
+        entry = (score(art, ts, now), -seq, art)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return [art for _, _, art in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+
+@METRICS.timed("rank")
+def top_articles(industries, limit, score=None):
+    """
+    Top `limit` stored articles across `industries` (see iter_stored_articles). Without
+    `score` that is simply the newest ones; with a scoring function (see make_scorer) the
+    best of the newest limit * TOPK_CANDIDATES candidates.
+    """
+    if not industries or limit <= 0:
+        return []
+    stream = iter_stored_articles(industries)
+    if score is None:
+        return [art for art, _ in itertools.islice(stream, limit)]
+    return select_top(itertools.islice(stream, limit * TOPK_CANDIDATES), limit, score)
+
+
+def send_notification(title, message, raise_errors=False):
+    """Desktop notification via plyer; on failure it is printed instead, or re-raised with `raise_errors`."""
+    if not message:
+        message = ""
+    if len(message) > 250:
+        message = message[:247] + "..."
+    try:
+        from plyer import notification
+        notification.notify(title=title, message=message, timeout=8)
+    except Exception as e:
+        if raise_errors:
+            raise
+        print("Notification error:", e)
+        print(f"{title}\n{message}")
+
+
+def industry_query(industry):
+    if industry == "Global":
+        return "artificial intelligence OR AI"
+    return f"artificial intelligence {industry}"
+
+
+class HostRateLimiter:
+    """Spaces out request starts to the same host by at least `min_interval` seconds."""
+
+    def __init__(self, min_interval=HOST_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if self.min_interval <= 0:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+HOST_LIMITER = HostRateLimiter()
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class QuotaExhausted(Exception):
+    pass
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `capacity` tokens per `period` seconds."""
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def try_acquire(self, n=1):
+        with self._lock:
+            self._refill()
+            if self._tokens < n:
+                return False
+            self._tokens -= n
+            return True
+
+    def remaining(self):
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
+
+    def refund(self, n=1):
+        """Give back tokens taken for a call that was not made."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + n)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds, then lets a single trial call through (half-open): success
+    closes it again, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=BREAKER_FAILURES, reset_timeout=BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half-open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+def _retry_after(resp):
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+class ResilientFetcher:
+    """
+    GET-JSON over one shared requests.Session with jittered exponential backoff
+    (honouring Retry-After on 429/5xx), a circuit breaker per endpoint and a token bucket
+    for the daily API quota. The last good response per `cache_key` is kept and served
+    while the endpoint's breaker is open or the quota is spent.
+    """
+
+    def __init__(self, retries=FETCH_RETRIES, daily_quota=NEWSAPI_DAILY_QUOTA,
+                 breaker_failures=BREAKER_FAILURES, breaker_reset=BREAKER_RESET):
+        self.retries = retries
+        self.quota = TokenBucket(daily_quota, 24 * 3600)
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self._session = None
+        self._breakers = {}
+        self._last_good = {}
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.fallbacks = 0
+
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_CONCURRENCY)
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def breaker(self, url):
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(self.breaker_failures, self.breaker_reset)
+            return self._breakers[endpoint]
+
+    def get_json(self, url, params=None, cache_key=None):
+        try:
+            data = self._get_with_retries(url, params).json()
+        except (CircuitOpen, QuotaExhausted, requests.RequestException) as e:
+            with self._lock:
+                fallback = self._last_good.get(cache_key) if cache_key is not None else None
+                if fallback is not None:
+                    self.fallbacks += 1
+            METRICS.inc("fetch_fallbacks", reason=type(e).__name__, served=fallback is not None)
+            if fallback is None:
+                raise
+            print(f"Serving last good result for {cache_key}: {e}")
+            return fallback
+        if cache_key is not None:
+            with self._lock:
+                self._last_good[cache_key] = data
+        return data
+
+    def get(self, url, params=None, stream=False, use_quota=True):
+        """
+        Successful response to a GET, with the retries, host spacing and circuit breaker of
+        get_json but no last-good fallback. `use_quota=False` for endpoints outside the API plan.
+        """
+        return self._get_with_retries(url, params, stream, use_quota)
+
+    def _get_with_retries(self, url, params, stream=False, use_quota=True):
+        breaker = self.breaker(url)
+        error = None
+        for attempt in range(self.retries + 1):
+            # quota first: allow() may turn an open breaker half-open, and that trial
+            # must then actually be made and recorded
+            if use_quota and not self.quota.try_acquire():
+                raise QuotaExhausted("daily API quota used up")
+            if not breaker.allow():
+                if use_quota:
+                    self.quota.refund()
+                raise CircuitOpen(f"circuit open for {url}")
+            ok = False
+            delay = None
+            try:
+                HOST_LIMITER.wait(url)
+                with self._lock:
+                    self.attempts += 1
+                try:
+                    resp = self.session().get(url, params=params, timeout=FETCH_TIMEOUT, stream=stream)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    METRICS.inc("http_requests", status=type(e).__name__)
+                    error = e
+                else:
+                    METRICS.inc("http_requests", status=resp.status_code)
+                    if resp.status_code != 429 and resp.status_code < 500:
+                        ok = True
+                    else:
+                        error = requests.HTTPError(f"{resp.status_code} from {url}", response=resp)
+                        delay = _retry_after(resp)
+                        resp.close()
+            finally:
+                # any other exception counts as a failure too, so a half-open trial always ends
+                if ok:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+            if ok:
+                resp.raise_for_status()
+                return resp
+            if attempt < self.retries:
+                if delay is None:
+                    delay = random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+                time.sleep(min(delay, BACKOFF_MAX))
+        raise error
+
+
+NEWSAPI_FETCHER = ResilientFetcher()
+
+
+def fetch_news_for_industry(industry, page_size=6, since=None):
+    """
+    Fetch articles from NewsAPI. If NEWSAPI_KEY is empty, return sample data for testing.
+    If industry == 'Global' it queries general AI news without adding the industry keyword.
+    `since` (ISO timestamp) limits the query to articles published from then on.
+    """
+    if not NEWSAPI_KEY or NEWSAPI_KEY == "YOUR_NEWSAPI_KEY":
+        now = datetime.datetime.now()
+        return [
+            {
+                "title": f"{industry}: AI adoption rises in 2025",
+                "description": f"Companies in {industry} are increasing use of AI to automate workflows and improve insights.",
+                "url": "https://example.com/article1",
+                "urlToImage": None,
+                "source": {"name": "ExampleNews"},
+                "publishedAt": now.isoformat()
+            },
+            {
+                "title": f"{industry}: New AI model improves predictions",
+                "description": f"A new model tailored for {industry} gives better predictions with fewer labels.",
+                "url": "https://example.com/article2",
+                "urlToImage": None,
+                "source": {"name": "ExampleNews"},
+                "publishedAt": (now - datetime.timedelta(hours=2)).isoformat()
+            }
+        ][:page_size]
+
+    url = NEWSAPI_URL
+    params = {
+        "q": industry_query(industry),
+        "language": "en",
+        "sortBy": "publishedAt",
+        "pageSize": page_size,
+        "apiKey": NEWSAPI_KEY
+    }
+    if since:
+        params["from"] = since
+    data = NEWSAPI_FETCHER.get_json(url, params=params, cache_key=(params["q"], page_size))
+    return data.get("articles", [])
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _plain_text(value):
+    return html.unescape(_TAG_RE.sub("", value or "")).strip()
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def matches_industry(industry, article):
+    """Whether a general feed item belongs to `industry`: everything is Global, otherwise the
+    industry name must appear as a word (case-sensitively for acronyms such as IT)."""
+    if industry == "Global":
+        return True
+    flags = 0 if industry.isupper() else re.IGNORECASE
+    text = f"{article.get('title') or ''} {article.get('description') or ''}"
+    return re.search(rf"\b{re.escape(industry)}\b", text, flags) is not None
+
+
+def _is_newer(article, since):
+    return not since or parse_published(article.get("publishedAt")) >= parse_published(since)
+
+
+class NewsSource(abc.ABC):
+    """
+    Adapter for one news source. `fetch` returns an iterable of articles in the NewsAPI
+    dict shape (title, description, url, urlToImage, source, publishedAt) for `industry`,
+    at most `page_size` of them and, when `since` is given, none published before it.
+    """
+    name = "source"
+
+    @abc.abstractmethod
+    def fetch(self, industry, page_size, since=None):
+        ...
+
+
+class NewsAPISource(NewsSource):
+    name = "newsapi"
+
+    def fetch(self, industry, page_size, since=None):
+        return fetch_news_for_industry(industry, page_size=page_size, since=since)
+
+
+class RSSSource(NewsSource):
+    """
+    RSS 2.0 or Atom feed. The feed is downloaded once per ARTICLE_CACHE_TTL through
+    NEWSAPI_FETCHER (retries, host spacing, circuit breaker; not counted against the
+    NewsAPI quota) and every industry is filtered from that one copy. The response is
+    streamed into an incremental XML parser and each element is dropped once read, so
+    only the newest FEED_MAX_ITEMS parsed items are kept, never the document.
+    """
+
+    def __init__(self, url, name=None):
+        self.url = url
+        self.name = name or f"rss:{url}"
+
+    def fetch(self, industry, page_size, since=None):
+        found = []
+        for art in self.items():
+            if matches_industry(industry, art) and _is_newer(art, since):
+                found.append(dict(art))
+                if len(found) >= page_size:
+                    break
+        return found
+
+    def items(self):
+        return ARTICLE_CACHE.get((self.name, "feed"), self._download)
+
+    def _download(self):
+        with NEWSAPI_FETCHER.get(self.url, stream=True, use_quota=False) as resp:
+            return list(itertools.islice(self.parse(resp.iter_content(chunk_size=16384)), FEED_MAX_ITEMS))
+
+    def parse(self, chunks):
+        """Yield articles from an iterable of feed byte chunks."""
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+        feed_title = None
+        open_elems = []
+        in_item = 0
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    open_elems.append(elem)
+                    in_item += _local(elem.tag) in ("item", "entry")
+                    continue
+                open_elems.pop()
+                tag = _local(elem.tag)
+                if tag in ("item", "entry"):
+                    in_item -= 1
+                    yield self._article(elem, feed_title)
+                    if open_elems:
+                        open_elems[-1].remove(elem)
+                elif tag == "title" and not in_item and feed_title is None:
+                    feed_title = (elem.text or "").strip()
+
+    def _article(self, item, feed_title):
+        fields = {}
+        image = None
+        link = None
+        for child in item:
+            tag = _local(child.tag)
+            if tag == "link":
+                href = child.get("href")
+                if href is None:
+                    link = link or (child.text or "").strip()
+                elif child.get("rel", "alternate") == "alternate":
+                    link = link or href
+            elif tag in ("enclosure", "content", "thumbnail") and child.get("url"):
+                if tag != "enclosure" or (child.get("type") or "").startswith("image/"):
+                    image = image or child.get("url")
+            elif tag not in fields:
+                fields[tag] = child.text or ""
+        published = fields.get("pubDate") or fields.get("published") or fields.get("updated") or ""
+        if fields.get("pubDate"):
+            try:
+                published = email.utils.parsedate_to_datetime(published).isoformat()
+            except (TypeError, ValueError):
+                pass
+        return {
+            "title": _plain_text(fields.get("title")),
+            "description": _plain_text(fields.get("description") or fields.get("summary")),
+            "url": link,
+            "urlToImage": image,
+            "source": {"name": feed_title or urlsplit(self.url).netloc},
+            "publishedAt": published.strip(),
+        }
+
+
+class JSONLSource(NewsSource):
+    """
+    Local JSON-lines file with one article per line in the NewsAPI shape, optionally with
+    an "industries" list (otherwise items are matched like feed items). Like RSSSource,
+    the file is read once per ARTICLE_CACHE_TTL and every industry is filtered from that
+    one copy: lines are parsed one at a time and only the newest FEED_MAX_ITEMS are kept.
+    """
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or f"jsonl:{path}"
+
+    def fetch(self, industry, page_size, since=None):
+        found = []
+        for tagged, art in self.items():
+            if ((industry in tagged) if tagged else matches_industry(industry, art)) and _is_newer(art, since):
+                found.append(dict(art))
+                if len(found) >= page_size:
+                    break
+        return found
+
+    def items(self):
+        """(industries tag or None, article) pairs, newest first."""
+        return ARTICLE_CACHE.get((self.name, "file"), self._read)
+
+    def _read(self):
+        return heapq.nlargest(FEED_MAX_ITEMS, self._parse(), key=lambda item: parse_published(item[1].get("publishedAt")))
+
+    def _parse(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    art = json.loads(line)
+                except ValueError:
+                    continue
+                tagged = art.pop("industries", None)
+                if isinstance(art.get("source"), str):
+                    art["source"] = {"name": art["source"]}
+                yield tagged, art
+
+
+NEWSAPI_SOURCE = NewsAPISource()
+NEWS_SOURCES = [NEWSAPI_SOURCE]     # every industry is fetched from each of these
+
+
+class _PendingFetch:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ArticleCache:
+    """
+    Process-wide article cache keyed on (source, industry query, page_size), and on
+    (source, "feed") for the parsed feeds RSSSource shares between industries.
+    Entries expire after `ttl` seconds and the least recently used one is evicted
+    once `max_entries` is reached. Concurrent callers of the same key wait on a
+    single in-flight fetch instead of each hitting NewsAPI.
+    """
+
+    def __init__(self, ttl=ARTICLE_CACHE_TTL, max_entries=ARTICLE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (expires_at, articles)
+        self._inflight = {}             # key -> _PendingFetch
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                pending = self._inflight[key] = _PendingFetch()
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = loader()
+        except Exception as e:
+            pending.error = e
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl, pending.value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return pending.value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.done.set()
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries),
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+
+ARTICLE_CACHE = ArticleCache()
+
+
+def ingest_industry(industry, page_size=6, source=None):
+    """Fetch `industry` from `source` (NewsAPI by default), only articles newer than that
+    source's high-water mark, and store them."""
+    source = source or NEWSAPI_SOURCE
+    arts = list(source.fetch(industry, page_size, since=high_water_mark(source.name, industry)))
+    store_articles(industry, arts)
+    update_high_water_mark(source.name, industry, arts)
+    SUMMARIES.request(arts)
+    return arts
+
+
+def fetch_news_cached(industry, page_size=6, source=None):
+    """Cached ingest_industry shared by the scheduler and the dashboard.
+    Returns copies so callers can tag articles (e.g. `_industry`) freely."""
+    source = source or NEWSAPI_SOURCE
+    key = (source.name, industry_query(industry), page_size)
+    arts = ARTICLE_CACHE.get(key, lambda: ingest_industry(industry, page_size=page_size, source=source))
+    return [dict(a) for a in arts]
+
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+
+def _get_fetch_pool():
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY, thread_name_prefix="fetch")
+        return _fetch_pool
+
+
+def _timed_fetch(industry, page_size, source):
+    start = time.perf_counter()
+    try:
+        with PROFILER.section(), METRICS.timer("fetch", source=source.name):
+            arts = fetch_news_cached(industry, page_size, source)
+    except Exception as e:
+        e.elapsed = time.perf_counter() - start
+        raise
+    METRICS.inc("fetched_articles", len(arts), source=source.name)
+    return arts, time.perf_counter() - start
+
+
+def iter_industry_results(industries, page_size=6, sources=None, stats=None):
+    """
+    Fetch every industry from every source concurrently on the shared fetch pool and yield
+    (industry, articles) pairs as they complete, one per source. Failures are reported and
+    skipped. If `stats` is a dict, per-source calls, items, errors and seconds are added to it.
+    """
+    pool = _get_fetch_pool()
+    futures = {
+        pool.submit(_timed_fetch, ind, page_size, src): (ind, src)
+        for ind in industries for src in (sources or NEWS_SOURCES)
+    }
+    for fut in as_completed(futures):
+        ind, src = futures[fut]
+        st = {"calls": 0, "items": 0, "errors": 0, "seconds": 0.0}
+        if stats is not None:
+            st = stats.setdefault(src.name, st)
+        st["calls"] += 1
+        try:
+            arts, elapsed = fut.result()
+        except Exception as e:
+            st["errors"] += 1
+            st["seconds"] += getattr(e, "elapsed", 0.0)
+            print(f"Error fetching for {ind} from {src.name}: {e}")
+            continue
+        st["items"] += len(arts)
+        st["seconds"] += elapsed
+        yield ind, arts
+
+
+def refresh_industries(industries, page_size=6, sources=None):
+    """
+    Bring the article store up to date for `industries`, fetching concurrently.
+    Returns the per-source stats of this cycle.
+    """
+    stats = {}
+    for _ in iter_industry_results(industries, page_size, sources=sources, stats=stats):
+        pass
+    maybe_prune_articles()
+    return stats
+
+
+def log_refresh_stats(label, stats):
+    """One log line for a refresh_industries cycle; failed fetches also go to the fetch_errors metric."""
+    parts = []
+    for name, st in stats.items():
+        failed = f", {st['errors']} failed" if st["errors"] else ""
+        parts.append(f"{name}: {st['items']} items from {st['calls']} calls{failed} in {st['seconds']:.2f}s")
+        if st["errors"]:
+            METRICS.inc("fetch_errors", st["errors"], source=name)
+    print(f"[{label}] refreshed " + "; ".join(parts))
+
+
+def fetch_latest_headlines(username, page_size=8):
+    """(industries, newest HEADLINES_LIMIT articles) for the dashboard's headline window, refreshed first."""
+    industries = get_preferences(username)
+    if not industries:
+        return industries, []
+    log_refresh_stats(username, refresh_industries(industries, page_size=page_size))
+    return industries, top_articles(industries, HEADLINES_LIMIT)
+
+
+def prepare_preview(article):
+    title = article.get("title") or "No title"
+    desc = article.get("description") or article.get("content") or ""
+    if desc and len(desc) > 280:
+        desc = desc[:277] + "..."
+    return title, desc
+
+# Summaries 
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_SUMMARY_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from has have he her his in into is it its more new not of on "
+    "or our over said says she than that the their them they this to up was we were what when which who will "
+    "with would you".split())
+
+
+def summary_key(article):
+    """Hash of the text a summary is made from: identical text is summarized once, whatever URL or user it came with."""
+    text = f"{article.get('title') or ''}\n{article.get('description') or article.get('content') or ''}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def extractive_summary(title, text, max_chars=SUMMARY_MAX_CHARS):
+    """
+    Local, network-free summary: sentences are scored by how often their content words
+    occur in the article (plus overlap with the title, plus a bonus for the lead) and the
+    best ones are kept, in their original order, up to `max_chars`.
+    """
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    sentences = _SENTENCE_RE.split(text)
+    words = [[w for w in _SUMMARY_WORD_RE.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+    freq = {}
+    for ws in words:
+        for w in ws:
+            freq[w] = freq.get(w, 0) + 1
+    title_words = set(_SUMMARY_WORD_RE.findall((title or "").lower())) - _STOPWORDS
+    scores = []
+    for i, ws in enumerate(words):
+        score = sum(freq[w] for w in ws) / math.sqrt(len(ws)) if ws else 0.0
+        score += 2.0 * len(title_words.intersection(ws)) + (1.0 if i == 0 else 0.0)
+        scores.append((score, i))
+    keep, used = [], 0
+    for score, i in sorted(scores, reverse=True):
+        if used + len(sentences[i]) + 1 <= max_chars:
+            keep.append(i)
+            used += len(sentences[i]) + 1
+    if not keep:
+        best = max(scores)[1]
+        return sentences[best][:max_chars - 3] + "..."
+    return " ".join(sentences[i] for i in sorted(keep))
+
+
+class ExtractiveSummarizer:
+    """Summaries from extractive_summary; always available and fast."""
+    name = "extractive"
+
+    def summarize(self, articles):
+        return [extractive_summary(a.get("title"), a.get("description") or a.get("content")) for a in articles]
+
+
+class OpenAISummarizer:
+    """
+    One chat-completion request per batch, answered as a JSON array with one summary
+    per article. `base_url` points it at any OpenAI-compatible server (e.g. a local stub).
+    """
+    name = "openai"
+
+    def __init__(self, model=SUMMARY_MODEL, base_url=None, api_key=None, timeout=SUMMARY_TIMEOUT):
+        import openai   # only when actually used: see OPENAI_AVAILABLE
+        self.client = openai.OpenAI(base_url=base_url, api_key=api_key, timeout=timeout, max_retries=0)
+        self.model = model
+
+    def summarize(self, articles):
+        items = "\n\n".join(f"[{i}] {a.get('title') or ''}\n{a.get('description') or a.get('content') or ''}"
+                             for i, a in enumerate(articles, 1))
+        resp = self.client.chat.completions.create(model=self.model, temperature=0, messages=[
+            {"role": "system", "content": f"Summarize each numbered news item in one sentence of at most "
+                                          f"{SUMMARY_MAX_CHARS} characters. Reply with only a JSON array of "
+                                          f"{len(articles)} strings, in the same order."},
+            {"role": "user", "content": items},
+        ])
+        text = resp.choices[0].message.content or ""
+        summaries = json.loads(text[text.find("["):text.rfind("]") + 1])
+        if not isinstance(summaries, list) or len(summaries) != len(articles):
+            raise ValueError(f"expected {len(articles)} summaries, got {text[:80]!r}")
+        return [str(s).strip()[:SUMMARY_MAX_CHARS] for s in summaries]
+
+
+def make_summary_backend(kind=SUMMARY_BACKEND):
+    """Backend for a SUMMARY_BACKEND name; None for "off"."""
+    if kind == "off":
+        return None
+    if kind == "openai" or (kind == "auto" and OPENAI_AVAILABLE and os.environ.get("OPENAI_API_KEY")):
+        return OpenAISummarizer()
+    return ExtractiveSummarizer()
+
+
+@METRICS.timed("db", op="cached_summaries")
+def cached_summaries(keys):
+    """Stored summaries for content hashes: {hash: summary}."""
+    keys = list(keys)
+    out = {}
+    conn = get_conn()
+    for i in range(0, len(keys), SQL_VARIABLE_CHUNK):
+        chunk = keys[i:i + SQL_VARIABLE_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        out.update(conn.execute(f"SELECT content_hash, summary FROM summaries WHERE content_hash IN ({marks})", chunk))
+    return out
+
+
+@METRICS.timed("db", op="store_summaries")
+def store_summaries(pairs, backend):
+    now = time.time()
+    conn = get_conn()
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO summaries (content_hash, summary, backend, created_at) VALUES (?,?,?,?)",
+                         [(k, s, backend, now) for k, s in pairs])
+
+
+class SummaryService:
+    """
+    Summarizes articles in the background so digests never wait for it. request()
+    only queues articles (deduplicated by summary_key); a worker thread takes up to
+    `batch` at a time, skips those already in the summaries table, and summarizes
+    the rest with one backend call. A call that fails or runs past `timeout` seconds
+    has its batch summarized with ExtractiveSummarizer instead. Digests read summaries
+    with lookup(), which answers from memory or the table and never blocks on the worker.
+    `backend` is an object with summarize(articles) -> [str] or a SUMMARY_BACKEND name,
+    resolved on the worker thread (importing openai is slow).
+    """
+
+    def __init__(self, backend=SUMMARY_BACKEND, batch=SUMMARY_BATCH, timeout=SUMMARY_TIMEOUT,
+                 queue_size=SUMMARY_QUEUE_SIZE, cache_size=SUMMARY_CACHE_SIZE, batch_wait=SUMMARY_BATCH_WAIT):
+        self.backend = backend
+        self.batch = batch
+        self.timeout = timeout
+        self.queue_size = queue_size
+        self.cache_size = cache_size
+        self.batch_wait = batch_wait
+        self.fallback = ExtractiveSummarizer()
+        self._pending = OrderedDict()   # summary_key -> article, oldest first
+        self._recent = OrderedDict()    # summary_key -> summary, LRU
+        self._cond = threading.Condition()
+        self._thread = None
+        self._call = None               # backend call of the current/last batch
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary-call")
+        self._busy = 0
+        self._stopping = False
+        self.counts = {"batches": 0, "summarized": 0, "cached": 0, "fallbacks": 0, "dropped": 0}
+
+    @property
+    def enabled(self):
+        return self.backend != "off" and self.backend is not None
+
+    def request(self, articles):
+        """Queue `articles` for summarizing; never blocks."""
+        if not self.enabled or not articles:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="summaries", daemon=True)
+                self._thread.start()
+            for art in articles:
+                key = summary_key(art)
+                if key in self._pending or key in self._recent:
+                    continue
+                if len(self._pending) >= self.queue_size:
+                    self.counts["dropped"] += 1
+                    continue
+                self._pending[key] = art
+            self._cond.notify()
+
+    def lookup(self, articles):
+        """
+        Summaries for `articles` in order, None where there is none yet; those are
+        queued with request() so a later digest has them.
+        """
+        if not self.enabled:
+            return [None] * len(articles)
+        keys = [summary_key(a) for a in articles]
+        with self._cond:
+            found = {k: self._recent[k] for k in keys if k in self._recent}
+            ask = [k for k in keys if k not in found and k not in self._pending]
+        if ask:
+            stored = cached_summaries(ask)
+            with self._cond:
+                for k, summary in stored.items():
+                    self._remember(k, summary)
+            found.update(stored)
+        missing = [a for k, a in zip(keys, articles) if k not in found]
+        if missing:
+            self.request(missing)
+        return [found.get(k) for k in keys]
+
+    def _remember(self, key, summary):
+        self._recent[key] = summary
+        self._recent.move_to_end(key)
+        if len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._stopping:
+                        self._cond.wait()
+                    if self._stopping:
+                        return
+                    # let one refresh cycle's ingests fill a batch before calling the backend
+                    deadline = time.monotonic() + self.batch_wait
+                    while len(self._pending) < self.batch and not self._stopping:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    batch = [self._pending.popitem(last=False) for _ in range(min(self.batch, len(self._pending)))]
+                    self._busy = len(batch)
+                try:
+                    self._summarize(batch)
+                except Exception as e:
+                    print(f"[summaries] batch of {len(batch)} failed: {e}")
+                with self._cond:
+                    self._busy = 0
+                    self._cond.notify_all()
+        finally:
+            close_conn()
+
+    def _summarize(self, batch):
+        stored = cached_summaries([k for k, _ in batch])
+        todo = [(k, a) for k, a in batch if k not in stored]
+        summaries = []
+        if todo:
+            summaries, name = self._call_backend([a for _, a in todo])
+            store_summaries([(k, s) for (k, _), s in zip(todo, summaries)], name)
+            METRICS.inc("summaries", len(todo), backend=name)
+        with self._cond:
+            for k, summary in itertools.chain(stored.items(), ((k, s) for (k, _), s in zip(todo, summaries))):
+                self._remember(k, summary)
+            self.counts["batches"] += 1 if todo else 0
+            self.counts["summarized"] += len(todo)
+            self.counts["cached"] += len(stored)
+
+    def _call_backend(self, articles):
+        """(summaries, name of the backend that made them)."""
+        if isinstance(self.backend, str):
+            try:
+                self.backend = make_summary_backend(self.backend) or self.fallback
+            except Exception as e:
+                # e.g. --summaries openai without the package: summarize locally from now on
+                print(f"[summaries] {self.backend} backend unavailable ({e!r}), using {self.fallback.name}")
+                METRICS.inc("summary_fallbacks", backend=self.backend)
+                self.backend = self.fallback
+                with self._cond:
+                    self.counts["fallbacks"] += len(articles)
+        backend = self.backend
+        if backend is not self.fallback:
+            try:
+                if self._call is not None and not self._call.done():
+                    # the last call is still running past its timeout: do not queue behind it
+                    raise TimeoutError("previous call still running")
+                self._call = self._pool.submit(backend.summarize, articles)
+                with METRICS.timer("summarize", backend=backend.name):
+                    return self._call.result(timeout=self.timeout), backend.name
+            except Exception as e:
+                METRICS.inc("summary_fallbacks", backend=backend.name)
+                print(f"[summaries] {backend.name} failed ({e!r}), summarizing {len(articles)} articles locally")
+                with self._cond:
+                    self.counts["fallbacks"] += len(articles)
+        return self.fallback.summarize(articles), self.fallback.name
+
+    def flush(self, timeout=None):
+        """Wait until every queued article is summarized; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=5):
+        """Summarize what is queued (up to `timeout` seconds), then stop the worker."""
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._pool.shutdown(wait=False)
+        self._thread = None
+        self._stopping = False
+
+    def stats(self):
+        with self._cond:
+            return dict(self.counts, queued=len(self._pending), in_flight=self._busy, cached_in_memory=len(self._recent))
+
+
+SUMMARIES = SummaryService()
+
+# Scheduler & notifier 
+class DesktopSink:
+    """Desktop notification via plyer (see send_notification); failures reach the dispatcher."""
+    name = "desktop"
+    rate_limited = True     # a burst of popups is unreadable; other sinks take digests as fast as they can
+
+    def send(self, username, title, message):
+        send_notification(title, message, raise_errors=True)
+
+
+class FileSink:
+    """Appends one JSON object per notification to `path`."""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f"file:{path}"
+        self._lock = threading.Lock()
+
+    def send(self, username, title, message):
+        line = json.dumps({"time": time.time(), "user": username, "title": title, "message": message})
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class WebhookSink:
+    """POSTs {"user", "title", "message"} as JSON to `url`."""
+
+    def __init__(self, url, timeout=FETCH_TIMEOUT):
+        self.url = url
+        self.name = f"webhook:{urlsplit(url).netloc}"
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def send(self, username, title, message):
+        self._session.post(self.url, json={"user": username, "title": title, "message": message},
+                           timeout=self.timeout).raise_for_status()
+
+
+class EmailSink:
+    """
+    Plain-text mail through the SMTP server at host:port (e.g. a local relay), to
+    <username>@`domain`. Each delivery thread keeps its own connection open (smtplib
+    connections are not thread-safe) and re-opens it when the server drops it.
+    """
+
+    def __init__(self, host="localhost", port=25, sender="ai-trends@localhost", domain="localhost", timeout=10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.domain = domain
+        self.timeout = timeout
+        self.name = f"email:{host}:{port}"
+        self._local = threading.local()
+
+    def send(self, username, title, message):
+        import smtplib
+        from email.message import EmailMessage
+        msg = EmailMessage()
+        msg["From"] = self.sender
+        msg["To"] = f"{username}@{self.domain}"
+        msg["Subject"] = title
+        msg.set_content(message)
+        for attempt in range(2):
+            if getattr(self._local, "smtp", None) is None:
+                self._local.smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                self._local.smtp.send_message(msg)
+                return
+            except smtplib.SMTPServerDisconnected:
+                self._local.smtp = None
+                if attempt:
+                    raise
+
+
+class _SinkLane:
+    """One sink's queue and workers: pending digests keyed by user, oldest first."""
+
+    def __init__(self, sink, workers, queue_size, rate, burst):
+        self.sink = sink
+        self.queue_size = queue_size
+        self.rate = rate if getattr(sink, "rate_limited", False) else None
+        self.bucket = TokenBucket(burst, burst / self.rate) if self.rate else None
+        self.workers = workers
+        self.pending = OrderedDict()        # username -> (title, message, enqueued_at)
+        self.busy = 0
+        self.cond = threading.Condition()
+        self.threads = []
+        self.latencies = deque(maxlen=1000)
+        self.delivered = self.failed = self.coalesced = self.dropped = 0
+        self.unlogged_drops = 0
+        self.drop_logged_at = None
+
+
+class NotificationDispatcher:
+    """
+    Delivers notifications off the caller's thread. Every sink gets its own bounded queue
+    and worker thread(s), so a slow or hung sink only backs up its own queue. A digest
+    submitted for a user who still has one waiting replaces it (coalescing), a full queue
+    drops the new digest instead of blocking (logged at most every NOTIFY_DROP_LOG_INTERVAL
+    seconds per sink), and sinks with `rate_limited` set (the desktop) get at most `rate`
+    deliveries/second with bursts of `burst` (rate=None: unlimited).
+    """
+
+    def __init__(self, sinks, workers=NOTIFY_WORKERS, queue_size=NOTIFY_QUEUE_SIZE,
+                 rate=NOTIFY_RATE, burst=NOTIFY_BURST):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.rate = rate
+        self.burst = burst
+        self._lanes = [_SinkLane(s, workers, queue_size, rate, burst) for s in sinks]
+        self._stopping = False
+
+    @property
+    def sinks(self):
+        return [lane.sink for lane in self._lanes]
+
+    def add_sink(self, sink):
+        self._lanes.append(_SinkLane(sink, self.workers, self.queue_size, self.rate, self.burst))
+
+    def submit(self, username, title, message):
+        """Queue a notification on every sink; never blocks. Returns False if any sink dropped it."""
+        now = time.perf_counter()
+        accepted = True
+        for lane in self._lanes:
+            with lane.cond:
+                if not lane.threads:
+                    self._start(lane)
+                if username in lane.pending:
+                    lane.coalesced += 1
+                    lane.pending[username] = (title, message, lane.pending[username][2])
+                elif len(lane.pending) >= lane.queue_size:
+                    lane.dropped += 1
+                    METRICS.inc("notify_dropped", sink=lane.sink.name)
+                    self._log_drop(lane, now)
+                    accepted = False
+                    continue
+                else:
+                    lane.pending[username] = (title, message, now)
+                lane.cond.notify()
+        return accepted
+
+    @staticmethod
+    def _log_drop(lane, now):
+        # called with lane.cond held
+        lane.unlogged_drops += 1
+        if lane.drop_logged_at is None or now - lane.drop_logged_at >= NOTIFY_DROP_LOG_INTERVAL:
+            print(f"{lane.sink.name} queue full ({lane.queue_size}): dropped {lane.unlogged_drops} notification(s)")
+            lane.unlogged_drops = 0
+            lane.drop_logged_at = now
+
+    def _start(self, lane):
+        for i in range(lane.workers):
+            t = threading.Thread(target=self._work, args=(lane,), name=f"notify-{lane.sink.name}-{i}", daemon=True)
+            t.start()
+            lane.threads.append(t)
+
+    def _work(self, lane):
+        while True:
+            with lane.cond:
+                while not lane.pending and not self._stopping:
+                    lane.cond.wait()
+                if self._stopping:
+                    return
+                username, (title, message, enqueued) = lane.pending.popitem(last=False)
+                lane.busy += 1
+            if lane.bucket is not None:
+                while not lane.bucket.try_acquire():
+                    time.sleep(1 / lane.rate)
+            try:
+                with METRICS.timer("notify", sink=lane.sink.name):
+                    lane.sink.send(username, title, message)
+                ok = True
+            except Exception as e:
+                ok = False
+                print(f"[{username}] {lane.sink.name} notification failed: {e}")
+            latency = time.perf_counter() - enqueued
+            METRICS.observe("notify_delivery", latency, sink=lane.sink.name)
+            with lane.cond:
+                lane.busy -= 1
+                if ok:
+                    lane.delivered += 1
+                    lane.latencies.append(latency)
+                else:
+                    lane.failed += 1
+                lane.cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until every queue is empty and idle; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for lane in self._lanes:
+            with lane.cond:
+                while lane.pending or lane.busy:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    lane.cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=5):
+        """Deliver what is queued (up to `timeout` seconds), then stop the workers."""
+        self.flush(timeout)
+        self._stopping = True
+        for lane in self._lanes:
+            with lane.cond:
+                lane.cond.notify_all()
+            for t in lane.threads:
+                t.join(timeout)
+            lane.threads = []
+        self._stopping = False
+
+    def stats(self):
+        out = {}
+        for lane in self._lanes:
+            with lane.cond:
+                lat = sorted(lane.latencies)
+                out[lane.sink.name] = {
+                    "queued": len(lane.pending),
+                    "in_flight": lane.busy,
+                    "delivered": lane.delivered,
+                    "failed": lane.failed,
+                    "coalesced": lane.coalesced,
+                    "dropped": lane.dropped,
+                    "latency_avg": sum(lat) / len(lat) if lat else 0.0,
+                    "latency_p95": lat[int(len(lat) * 0.95) - 1] if lat else 0.0,
+                }
+        return out
+
+
+DISPATCHER = NotificationDispatcher([DesktopSink()])
+
+
+def build_digest(industries, all_articles):
+    """Digest text for the top articles, using their SUMMARIES where ready and the preview text otherwise."""
+    top = all_articles[:NOTIFICATION_LIMIT]
+    msgs = []
+    for art, summary in zip(top, SUMMARIES.lookup(top)):
+        t, s = prepare_preview(art)
+        msgs.append(f"{t} — {summary or s}")
+    combined = "\n\n".join(msgs)
+    header = f"AI Trends — {', '.join(industries)}"
+    return header, combined
+
+
+def notify_digest(industries, all_articles, username=None):
+    """Queue the digest on DISPATCHER (returns at once); without a username, show it directly."""
+    if not all_articles:
+        title, message = "AI Trends", "No articles found at the moment."
+    else:
+        title, message = build_digest(industries, all_articles)
+    if username is None:
+        send_notification(title, message)
+    else:
+        DISPATCHER.submit(username, title, message)
+
+
+def gather_and_notify(username):
+    industries = get_preferences(username)
+    if not industries:
+        print(f"[{username}] No industries selected.")
+        return
+    with PROFILER.section(), METRICS.timer("cycle"):
+        log_refresh_stats(username, refresh_industries(industries, page_size=6))
+        notify_digest(industries, top_articles(industries, NOTIFICATION_LIMIT, score=DIGEST_SCORER), username)
+
+
+def notify_batch(usernames, page_size=6):
+    """
+    Notify several users at once: the union of their industries is fetched once
+    (one request per distinct industry) and each user's digest is read from the store.
+    """
+    prefs = get_preferences_many(usernames)
+    union = []
+    for u, industries in prefs.items():
+        if not industries:
+            print(f"[{u}] No industries selected.")
+        for ind in industries:
+            if ind not in union:
+                union.append(ind)
+    if not union:
+        return
+    with PROFILER.section(), METRICS.timer("cycle"):
+        log_refresh_stats(f"batch of {len(prefs)}", refresh_industries(union, page_size))
+        for u, industries in prefs.items():
+            if not industries:
+                continue
+            try:
+                notify_digest(industries, top_articles(industries, NOTIFICATION_LIMIT, score=DIGEST_SCORER), u)
+            except Exception as e:
+                METRICS.inc("notify_errors", sink="digest")
+                print(f"[{u}] Notification failed: {e}")
+
+
+def notify_time(value):
+    """argparse type for a daily "HH:MM" time; returns it zero-padded."""
+    try:
+        t = datetime.datetime.strptime(value, "%H:%M")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time {value!r}, expected HH:MM (00:00-23:59)")
+    return t.strftime("%H:%M")
+
+
+def _next_occurrence(hhmm, after):
+    hour, minute = map(int, hhmm.split(":"))
+    due = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if due <= after:
+        due += datetime.timedelta(days=1)
+    return due
+
+
+class NotificationScheduler:
+    """
+    Single scheduler thread owning every user's notification times. All users due
+    at the same "HH:MM" slot are notified together through notify_batch, and the
+    thread sleeps until the next due slot (or until a user is added/removed)
+    instead of polling.
+    """
+
+    def __init__(self):
+        self._users = {}        # username -> tuple of "HH:MM" times
+        self._due = {}          # "HH:MM" -> next datetime it fires
+        self._immediate = []    # users to notify as soon as possible
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopping = False
 
-def validate_user(username, password):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT * FROM users WHERE username=? AND password=?", (username, password))
-    row = c.fetchone()
-    conn.close()
-    return bool(row)
+    def add_user(self, username, times=(MORNING_TIME, EVENING_TIME), notify_now=True):
+        with self._lock:
+            self._users[username] = tuple(times)
+            now = datetime.datetime.now()
+            for t in times:
+                if t not in self._due:
+                    self._due[t] = _next_occurrence(t, now)
+            if notify_now and username not in self._immediate:
+                self._immediate.append(username)
+        self._wake.set()
 
-def save_preferences(username, industries_list):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("REPLACE INTO preferences (username, industries) VALUES (?, ?)", (username, ",".join(industries_list)))
-    conn.commit()
-    conn.close()
+    def remove_user(self, username):
+        with self._lock:
+            self._users.pop(username, None)
+            if username in self._immediate:
+                self._immediate.remove(username)
+            live = {t for times in self._users.values() for t in times}
+            for t in list(self._due):
+                if t not in live:
+                    del self._due[t]
+        self._wake.set()
+
+    def users(self):
+        with self._lock:
+            return dict(self._users)
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="notification-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _take_due_batch(self):
+        """Return (users, timeout): users to notify now, or how long to sleep."""
+        with self._lock:
+            if self._immediate:
+                batch, self._immediate = self._immediate, []
+                return batch, 0
+            if not self._due:
+                return [], None
+            now = datetime.datetime.now()
+            slot, due = min(self._due.items(), key=lambda kv: kv[1])
+            if due > now:
+                return [], (due - now).total_seconds()
+            self._due[slot] = _next_occurrence(slot, now)
+            return [u for u, times in self._users.items() if slot in times], 0
+
+    def _run(self):
+        while not self._stopping:
+            batch, timeout = self._take_due_batch()
+            if batch:
+                try:
+                    notify_batch(batch)
+                except Exception as e:
+                    print("Scheduler error:", e)
+                continue
+            if timeout != 0:
+                self._wake.wait(timeout)
+                self._wake.clear()
 
-def get_preferences(username):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT industries FROM preferences WHERE username=?", (username,))
-    row = c.fetchone()
-    conn.close()
-    if row and row[0]:
-        return row[0].split(",")
-    return []
-
-def send_notification(title, message):
-    if not message:
-        message = ""
-    if len(message) > 250:
-        message = message[:247] + "..."
-    try:
-        notification.notify(title=title, message=message, timeout=8)
-    except Exception as e:
-        print("Notification error:", e)
 
+SCHEDULER = NotificationScheduler()
 
-def fetch_news_for_industry(industry, page_size=6):
+
+def start_scheduler(username, morning_time=MORNING_TIME, evening_time=EVENING_TIME):
+    """Register `username` with the shared scheduler (notifying immediately) and make sure it runs."""
+    SCHEDULER.add_user(username, times=(morning_time, evening_time))
+    SCHEDULER.start()
+
+# Thumbnail cache 
+class ThumbnailCache:
     """
-    Fetch articles from NewsAPI. If NEWSAPI_KEY is empty, return sample data for testing.
-    If industry == 'Global' it queries general AI news without adding the industry keyword.
+    Two-tier cache of headline thumbnails.
+    Memory: LRU of decoded THUMB_SIZE PIL images, capped at `memory_bytes`.
+    Disk: already-thumbnailed JPEGs in `cache_dir`, named by URL hash, with a JSON
+    sidecar holding the ETag/Last-Modified validators. Entries younger than
+    `revalidate_after` are served without any network I/O; older ones are revalidated
+    with a conditional GET. The least recently used files are evicted once the
+    directory exceeds `disk_bytes`.
     """
-    if not NEWSAPI_KEY or NEWSAPI_KEY == "YOUR_NEWSAPI_KEY":
-        now = datetime.datetime.now()
-        return [
-            {
-                "title": f"{industry}: AI adoption rises in 2025",
-                "description": f"Companies in {industry} are increasing use of AI to automate workflows and improve insights.",
-                "url": "https://example.com/article1",
-                "urlToImage": None,
-                "source": {"name": "ExampleNews"},
-                "publishedAt": now.isoformat()
-            },
-            {
-                "title": f"{industry}: New AI model improves predictions",
-                "description": f"A new model tailored for {industry} gives better predictions with fewer labels.",
-                "url": "https://example.com/article2",
-                "urlToImage": None,
-                "source": {"name": "ExampleNews"},
-                "publishedAt": (now - datetime.timedelta(hours=2)).isoformat()
-            }
-        ][:page_size]
 
-    if industry == "Global":
-        q = "artificial intelligence OR AI"
-    else:
-        q = f"artificial intelligence {industry}"
-    url = "https://newsapi.org/v2/everything"
-    params = {
-        "q": q,
-        "language": "en",
-        "sortBy": "publishedAt",
-        "pageSize": page_size,
-        "apiKey": NEWSAPI_KEY
-    }
-    resp = requests.get(url, params=params, timeout=12)
-    resp.raise_for_status()
-    data = resp.json()
-    return data.get("articles", [])
+    def __init__(self, cache_dir=THUMB_CACHE_DIR, memory_bytes=THUMB_MEMORY_BYTES,
+                 disk_bytes=THUMB_DISK_BYTES, revalidate_after=THUMB_REVALIDATE_AFTER):
+        self.cache_dir = cache_dir
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.revalidate_after = revalidate_after
+        self._mem = OrderedDict()       # url -> (PIL image, nbytes)
+        self._mem_used = 0
+        self._disk_used = None          # computed on first write
+        self._lock = threading.Lock()
 
+    def peek(self, url):
+        """Decoded thumbnail from memory, or None. Never touches disk or network."""
+        with self._lock:
+            entry = self._mem.get(url)
+            if entry is None:
+                return None
+            self._mem.move_to_end(url)
+            return entry[0]
 
-def prepare_preview(article):
-    title = article.get("title") or "No title"
-    desc = article.get("description") or article.get("content") or ""
-    if desc and len(desc) > 280:
-        desc = desc[:277] + "..."
-    return title, desc
+    def _remember(self, url, img):
+        nbytes = img.width * img.height * len(img.getbands())
+        with self._lock:
+            old = self._mem.pop(url, None)
+            if old:
+                self._mem_used -= old[1]
+            self._mem[url] = (img, nbytes)
+            self._mem_used += nbytes
+            while self._mem_used > self.memory_bytes and len(self._mem) > 1:
+                _, (_, freed) = self._mem.popitem(last=False)
+                self._mem_used -= freed
 
-# Scheduler & notifier 
-def gather_and_notify(username):
-    industries = get_preferences(username)
-    if not industries:
-        print(f"[{username}] No industries selected.")
-        return
-    all_articles = []
-    seen = set()
-    for ind in industries:
+    def _paths(self, url):
+        h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, h + ".jpg"), os.path.join(self.cache_dir, h + ".json")
+
+    def get(self, url, session=None, timeout=8):
+        """Thumbnail for `url` as a PIL image: memory, then disk, then network."""
+        img = self.peek(url)
+        if img is not None:
+            METRICS.inc("thumbnail_lookups", tier="memory")
+            return img
+        jpg_path, meta_path = self._paths(url)
+        meta = None
+        if os.path.exists(jpg_path):
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            if time.time() - meta.get("checked_at", 0) < self.revalidate_after:
+                img = self._load_disk(jpg_path)
+                if img is not None:
+                    METRICS.inc("thumbnail_lookups", tier="disk")
+                    self._remember(url, img)
+                    return img
+                meta = None
+
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        with METRICS.timer("image_download"):
+            r = (session or requests).get(url, headers=headers, timeout=timeout)
+        if r.status_code == 304 and meta is not None:
+            img = self._load_disk(jpg_path)
+            if img is not None:
+                METRICS.inc("thumbnail_lookups", tier="revalidated")
+                meta["checked_at"] = time.time()
+                self._write_file(meta_path, json.dumps(meta).encode("utf-8"))
+                self._remember(url, img)
+                return img
+            with METRICS.timer("image_download"):
+                r = (session or requests).get(url, timeout=timeout)
+        r.raise_for_status()
+        METRICS.inc("thumbnail_lookups", tier="network")
+        img = make_thumbnail(r.content)
+        self._store_disk(jpg_path, meta_path, img, {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        })
+        self._remember(url, img)
+        return img
+
+    def _load_disk(self, jpg_path):
+        try:
+            img = Image.open(jpg_path)
+            img.load()
+            os.utime(jpg_path)      # mtime doubles as last-access for eviction
+            return img
+        except OSError:
+            return None
+
+    def _write_file(self, path, data):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _store_disk(self, jpg_path, meta_path, img, meta):
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=85)
+        data = buf.getvalue()
         try:
-            arts = fetch_news_for_industry(ind, page_size=6)
-            for a in arts:
-                # skip duplicates by URL
-                u = a.get('url')
-                if u and u in seen:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            old_size = os.path.getsize(jpg_path) if os.path.exists(jpg_path) else 0
+            self._write_file(jpg_path, data)
+            self._write_file(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            print("Thumbnail cache write failed:", e)
+            return
+        with self._lock:
+            if self._disk_used is not None:
+                self._disk_used += len(data) - old_size
+            over = self._disk_used is None or self._disk_used > self.disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".jpg"):
+                    st = os.stat(os.path.join(self.cache_dir, name))
+                    entries.append((st.st_mtime, st.st_size, name))
+            used = sum(e[1] for e in entries)
+            for _, size, name in sorted(entries):
+                if used <= self.disk_bytes:
+                    break
+                base = os.path.join(self.cache_dir, name[:-4])
+                for path in (base + ".jpg", base + ".json"):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                used -= size
+            self._disk_used = used
+
+
+def make_thumbnail(data):
+    """Decode image bytes straight to a THUMB_SIZE RGB thumbnail (JPEG draft mode skips full-size decode)."""
+    img = Image.open(io.BytesIO(data))
+    img.draft("RGB", THUMB_SIZE)
+    img = img.convert("RGB")
+    img.thumbnail(THUMB_SIZE)
+    return img
+
+
+THUMBNAILS = ThumbnailCache()
+
+
+class ImageLoader:
+    """
+    Fixed pool of thumbnail download workers sharing one keep-alive requests.Session.
+    Jobs run lowest priority first; `prioritize` bumps URLs (e.g. cards scrolled into
+    view) to the front, and `cancel_pending` drops every queued job and suppresses the
+    callbacks of jobs already running. Download, decode and thumbnailing all happen on
+    the worker; `callback(url, pil_image)` is called from the worker thread.
+    """
+
+    def __init__(self, workers=IMAGE_WORKERS):
+        self.workers = workers
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._pending = {}              # url -> job dict, for jobs not started yet
+        self._running = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._threads = []
+        self._session = None
+        self._latencies = deque(maxlen=200)
+        self.completed = 0
+        self.failed = 0
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"image-loader-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, url, callback, priority=100):
+        with self._lock:
+            self._ensure_started()
+            job = self._pending.get(url)
+            if job is None:
+                job = self._pending[url] = {"url": url, "callbacks": [], "generation": self._generation}
+            job["callbacks"].append(callback)
+            self._queue.put((priority, next(self._seq), job))
+
+    def prioritize(self, urls, priority=0):
+        with self._lock:
+            for url in urls:
+                job = self._pending.get(url)
+                if job is not None:
+                    self._queue.put((priority, next(self._seq), job))
+
+    def cancel_pending(self):
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+
+    def stats(self):
+        with self._lock:
+            lat = sorted(self._latencies)
+            depth = len(self._pending)
+        return {
+            "queue_depth": depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "latency_avg": sum(lat) / len(lat) if lat else 0.0,
+            "latency_p95": lat[int(len(lat) * 0.95) - 1] if lat else 0.0,
+        }
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            with self._lock:
+                # stale duplicate (already started/finished elsewhere) or cancelled
+                if self._pending.get(job["url"]) is not job:
                     continue
-                if u:
-                    seen.add(u)
-                a["_industry"] = ind
-            all_articles.extend([a for a in arts if a.get('url') not in (None if None else set())])
-            # Note: the list comprehension above just keeps the pipeline similar; dedupe handled via 'seen'
-        except Exception as e:
-            print(f"Error fetching for {ind}: {e}")
-    if not all_articles:
-        send_notification("AI Trends", "No articles found at the moment.")
-        return
-    try:
-        all_articles.sort(key=lambda x: x.get("publishedAt", ""), reverse=True)
-    except Exception:
-        pass
-    top = all_articles[:NOTIFICATION_LIMIT]
-    msgs = []
-    for art in top:
-        t, s = prepare_preview(art)
-        msgs.append(f"{t} — {s}")
-    combined = "\n\n".join(msgs)
-    header = f"AI Trends — {', '.join(industries)}"
-    send_notification(header, combined)
+                del self._pending[job["url"]]
+                self._running += 1
+            start = time.perf_counter()
+            try:
+                pil = THUMBNAILS.get(job["url"], session=self._session)
+            except Exception:
+                pil = None
+            METRICS.observe("image_load", time.perf_counter() - start)
+            METRICS.inc("images", status="failed" if pil is None else "ok")
+            with self._lock:
+                self._running -= 1
+                self._latencies.append(time.perf_counter() - start)
+                if pil is None:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                current = job["generation"] == self._generation
+            if pil is not None and current:
+                for cb in job["callbacks"]:
+                    cb(job["url"], pil)
 
 
-def start_scheduler(username, morning_time=MORNING_TIME, evening_time=EVENING_TIME):
-    try:
-        gather_and_notify(username)
-    except Exception as e:
-        print("Immediate fetch failed:", e)
-    schedule.clear()
-    schedule.every().day.at(morning_time).do(lambda: gather_and_notify(username))
-    schedule.every().day.at(evening_time).do(lambda: gather_and_notify(username))
-    while True:
+IMAGE_LOADER = ImageLoader()
+
+METRICS.gauge("article_cache_hit_ratio", lambda: ARTICLE_CACHE.stats()["hit_rate"])
+METRICS.gauge("article_cache_entries", lambda: ARTICLE_CACHE.stats()["entries"])
+METRICS.gauge("newsapi_quota_remaining", lambda: NEWSAPI_FETCHER.quota.remaining())
+METRICS.gauge("image_queue_depth", lambda: IMAGE_LOADER.stats()["queue_depth"])
+METRICS.gauge("scheduled_users", lambda: len(SCHEDULER.users()))
+
+# Latest headlines list 
+def _article_key(article):
+    return article.get("url") or article.get("title") or ""
+
+
+class _HeadlineCard:
+    """Widgets for one headline card; rebound to another article when recycled."""
+
+    def __init__(self, canvas, app):
+        self.app = app
+        self.url = None
+        self.image_url = None
+        self.photo = None
+        bg = app.card_bg
+        self.frame = tk.Frame(canvas, bg=bg, padx=8, pady=8, height=HEADLINE_ROW_HEIGHT - 16)
+        self.frame.pack_propagate(False)
+
+        row = tk.Frame(self.frame, bg=bg)
+        row.pack(fill="x")
+        self.img_label = tk.Label(row, bg=bg)
+        self.img_label.pack(side="left", padx=(0,10))
+
+        text_col = tk.Frame(row, bg=bg)
+        text_col.pack(side="left", fill="both", expand=True)
+        self.title_lbl = tk.Label(text_col, bg=bg, fg=app.fg, font=("Arial", 12, "bold"), wraplength=760, justify="left")
+        self.title_lbl.pack(anchor="w")
+        self.title_lbl.bind("<Button-1>", lambda e: self.open())
+        self.title_lbl.bind("<Enter>", lambda e: self._hover(True))
+        self.title_lbl.bind("<Leave>", lambda e: self._hover(False))
+        self.meta_lbl = tk.Label(text_col, bg=bg, fg="#bfc7cf", font=("Arial", 9))
+        self.meta_lbl.pack(anchor="w", pady=(4,0))
+        self.summary_lbl = tk.Label(text_col, bg=bg, fg=app.fg, wraplength=760, justify="left")
+        self.summary_lbl.pack(anchor="w", pady=(6,4))
+
+        self.action_row = tk.Frame(text_col, bg=bg)
+        self.action_row.pack(fill="x")
+        self.open_btn = tk.Button(self.action_row, text="Open Article", bg="#5aa9ff", fg="white", command=self.open)
+        self.source_lbl = tk.Label(self.action_row, bg=bg, fg="#bfc7cf")
+        self.source_lbl.pack(side="right", padx=6)
+
+        self.window_id = canvas.create_window(10, 0, window=self.frame, anchor="nw")
+
+    def bind(self, art, priority):
+        self.url = art.get("url")
+        title = art.get("title") or "No title"
+        if len(title) > 160:
+            title = title[:157] + "..."
+        self.title_lbl.configure(text=title, cursor=("hand2" if self.url else ""))
+        summary = art.get("description") or art.get("content") or ""
+        if summary and len(summary) > 350:
+            summary = summary[:347] + "..."
+        source = (art.get("source") or {}).get("name") or ""
+        meta = f"{art.get('_industry','')} • {source or 'Unknown'} • {(art.get('publishedAt') or '')[:10]}"
+        self.meta_lbl.configure(text=meta)
+        self.summary_lbl.configure(text=summary)
+        self.source_lbl.configure(text=source)
+        if self.url:
+            self.open_btn.pack(side="left", padx=(0,6))
+        else:
+            self.open_btn.pack_forget()
+
+        image_url = art.get("urlToImage")
+        if image_url != self.image_url:
+            self.image_url = image_url
+            self.photo = None
+            self.img_label.configure(image="")
+        self.request_image(priority)
+
+    def request_image(self, priority):
+        if not self.image_url or self.photo is not None:
+            return
+        cached = THUMBNAILS.peek(self.image_url)
+        if cached is not None:
+            self.show_thumbnail(self.image_url, cached)
+        else:
+            self.app._load_image_async(self.image_url, self, priority=priority)
+
+    def show_thumbnail(self, url, pil):
+        """Main thread only. Ignored if the card has since been rebound to another image."""
+        if url != self.image_url or not self.frame.winfo_exists():
+            return
+        self.photo = ImageTk.PhotoImage(pil)
+        self.img_label.configure(image=self.photo)
+
+    def open(self):
+        if self.url:
+            try:
+                webbrowser.open(self.url)
+            except Exception:
+                pass
+
+    def _hover(self, inside):
+        if self.url:
+            try:
+                self.title_lbl.configure(font=("Arial", 12, "underline" if inside else "bold"))
+            except Exception:
+                pass
+
+
+class HeadlineList:
+    """
+    Virtualized article list on a Canvas. Every card occupies a fixed HEADLINE_ROW_HEIGHT
+    slot, so the rows in view follow directly from the scroll offset: only those rows
+    (plus HEADLINE_OVERSCAN on each side) have widgets, and cards scrolled out of view
+    are recycled for rows scrolling in. set_articles applies a diff: cards for articles
+    that are still listed are kept and moved rather than rebuilt.
+    """
+
+    def __init__(self, canvas, app):
+        self.canvas = canvas
+        self.app = app
+        self.articles = []
+        self.width = 0
+        self._cards = {}        # row -> _HeadlineCard
+        self._free = []
+
+    def visible_rows(self):
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        first = max(0, int(top // HEADLINE_ROW_HEIGHT) - HEADLINE_OVERSCAN)
+        last = min(len(self.articles), int((top + height) // HEADLINE_ROW_HEIGHT) + 1 + HEADLINE_OVERSCAN)
+        return range(first, last)
+
+    def set_articles(self, articles):
+        old_keys = [_article_key(a) for a in self.articles]
+        top = self.canvas.canvasy(0)
+        anchor_row = int(top // HEADLINE_ROW_HEIGHT)
+        anchor_key = old_keys[anchor_row] if anchor_row < len(old_keys) else None
+
+        new_rows = {}
+        for i, a in enumerate(articles):
+            new_rows.setdefault(_article_key(a), i)
+        cards, self._cards = self._cards, {}
+        for row, card in cards.items():
+            i = new_rows.get(old_keys[row])
+            if i is None or i in self._cards:
+                self._release(card)
+            else:
+                self._cards[i] = card
+        self.articles = list(articles)
+        for i, card in self._cards.items():
+            card.bind(self.articles[i], priority=1)
+
+        total = len(self.articles) * HEADLINE_ROW_HEIGHT
+        self.canvas.configure(scrollregion=(0, 0, self.width, total))
+        # once scrolled down, keep the article at the top of the view in place when new ones arrive above it
+        if top > 0 and anchor_key in new_rows and total:
+            offset = top - anchor_row * HEADLINE_ROW_HEIGHT
+            self.canvas.yview_moveto((new_rows[anchor_key] * HEADLINE_ROW_HEIGHT + offset) / total)
+        else:
+            self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def refresh(self):
+        """Materialize the rows in view and recycle the rest; cheap when nothing changed."""
+        wanted = self.visible_rows()
+        for row in [r for r in self._cards if r not in wanted]:
+            self._release(self._cards.pop(row))
+        in_view = []
+        for row in wanted:
+            card = self._cards.get(row)
+            if card is None:
+                card = self._cards[row] = self._acquire()
+                card.bind(self.articles[row], priority=0)
+            self.canvas.coords(card.window_id, 10, row * HEADLINE_ROW_HEIGHT + 8)
+            if card.image_url and card.photo is None:
+                in_view.append(card.image_url)
+        IMAGE_LOADER.prioritize(in_view)
+
+    def resize(self, width):
+        self.width = width
+        for card in list(self._cards.values()) + self._free:
+            self.canvas.itemconfigure(card.window_id, width=max(width - 20, 1))
+        self.canvas.configure(scrollregion=(0, 0, width, len(self.articles) * HEADLINE_ROW_HEIGHT))
+        self.refresh()
+
+    def _acquire(self):
+        if self._free:
+            card = self._free.pop()
+            self.canvas.itemconfigure(card.window_id, state="normal")
+            return card
+        card = _HeadlineCard(self.canvas, self.app)
+        if self.width:
+            self.canvas.itemconfigure(card.window_id, width=max(self.width - 20, 1))
+        return card
+
+    def _release(self, card):
+        self.canvas.itemconfigure(card.window_id, state="hidden")
+        self._free.append(card)
+
+
+# Tk bridge 
+class TkBridge:
+    """
+    Runs the GUI's blocking work (fetches, DB writes, password hashing) from one asyncio
+    event loop on a background thread and hands results back to Tk through a queue that
+    the Tk thread drains every `tick_ms`, spending at most `budget_ms` per tick so a burst
+    of results never stalls the UI.
+    Work is tagged with a `group`: `cancel(group)` (logout, window close) cancels what is
+    still running and drops results not yet delivered. Submitting the same fn and args
+    under a `key` that is already in flight returns the running job instead of starting
+    another (coalescing); different args run after it and supersede it, so its callbacks
+    are dropped and the latest submission is the one that lands last.
+    """
+
+    def __init__(self, root, tick_ms=TK_TICK_MS, budget_ms=TK_TICK_BUDGET_MS, workers=FETCH_CONCURRENCY):
+        self.root = root
+        self.tick_ms = tick_ms
+        self.budget = budget_ms / 1000
+        self.loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tk-bridge")
+        self.loop.set_default_executor(self._executor)
+        self._results = deque()         # (group, generation, fn, args), appended from any thread
+        self._generations = {}          # group -> bumped by cancel()
+        self._running = {}              # future -> group
+        self._inflight = {}             # key -> (future, fn, args) of the latest job
+        self._superseded = set()        # keyed futures whose callbacks are dropped
+        self._lock = threading.Lock()
+        self._after_id = None
+        self._stopped = False
+        self.coalesced = 0
+        self.longest_drain = 0.0
+        threading.Thread(target=self.loop.run_forever, name="tk-bridge", daemon=True).start()
+        self._schedule()
+
+    def _schedule(self):
+        self._after_id = self.root.after(self.tick_ms, self._drain)
+
+    def post(self, fn, *args, group=None):
+        """Call fn(*args) on the Tk thread at the next tick. Safe from any thread."""
+        self._results.append((group, self._generations.get(group, 0), fn, args))
+
+    def submit(self, fn, *args, on_done=None, on_error=None, group=None, key=None):
+        """
+        Run blocking fn(*args) off the Tk thread, then on_done(result) or on_error(exc) on
+        the Tk thread. Returns a concurrent.futures.Future.
+        """
+        with self._lock:
+            previous = self._inflight.get(key) if key is not None else None
+            if previous is not None and previous[1:] == (fn, args):
+                self.coalesced += 1
+                return previous[0]
+            if previous is not None:
+                self._superseded.add(previous[0])
+            generation = self._generations.get(group, 0)
+            after = previous[0] if previous is not None else None
+            fut = asyncio.run_coroutine_threadsafe(self._run(fn, args, after), self.loop)
+            self._running[fut] = group
+            if key is not None:
+                self._inflight[key] = (fut, fn, args)
+        fut.add_done_callback(lambda f: self._finished(f, key, group, generation, on_done, on_error))
+        return fut
+
+    async def _run(self, fn, args, after=None):
+        if after is not None:
+            # however the superseded job ends, this one starts only once it has
+            await asyncio.wait([asyncio.wrap_future(after)])
+        return await self.loop.run_in_executor(None, functools.partial(fn, *args))
+
+    def _finished(self, fut, key, group, generation, on_done, on_error):
+        with self._lock:
+            self._running.pop(fut, None)
+            if key is not None and self._inflight.get(key, (None,))[0] is fut:
+                del self._inflight[key]
+            superseded = fut in self._superseded
+            self._superseded.discard(fut)
+        if fut.cancelled() or superseded:
+            return
+        exc = fut.exception()
+        if exc is not None:
+            if on_error is None:
+                traceback.print_exception(type(exc), exc, exc.__traceback__)
+            else:
+                self._results.append((group, generation, on_error, (exc,)))
+        elif on_done is not None:
+            self._results.append((group, generation, on_done, (fut.result(),)))
+
+    def cancel(self, group):
+        """Cancel `group`'s running work and drop its undelivered results."""
+        with self._lock:
+            self._generations[group] = self._generations.get(group, 0) + 1
+            futures = [f for f, g in self._running.items() if g == group]
+        for fut in futures:
+            fut.cancel()
+
+    def _drain(self):
+        start = time.perf_counter()
         try:
-            schedule.run_pending()
-        except Exception as e:
-            print("Scheduler error:", e)
-        time.sleep(30)
+            while self._results and time.perf_counter() - start < self.budget:
+                group, generation, fn, args = self._results.popleft()
+                if generation != self._generations.get(group, 0):
+                    continue
+                try:
+                    fn(*args)
+                except Exception:
+                    traceback.print_exc()
+        finally:
+            self.longest_drain = max(self.longest_drain, time.perf_counter() - start)
+            if not self._stopped:
+                self._schedule()
+
+    def stop(self, wait=False):
+        """
+        Cancel everything and stop the loop (before the Tk root is destroyed). Blocking
+        calls already running finish in the background unless `wait` is set.
+        """
+        self._stopped = True
+        with self._lock:
+            groups = set(self._running.values())
+        for group in groups:
+            self.cancel(group)
+        self._results.clear()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def _shutdown(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
 
 class App:
     def __init__(self, root):
@@ -203,18 +3219,32 @@ class App:
         self.root.title("AI Trends Notifier")
         self.root.geometry("520x560")
         self.current_user = None
+        self.session_token = None
+        self.auth_btn = None
         self.dark_bg = "#22262b"
         self.card_bg = "#2f3338"
         self.fg = "#f1f3f5"
         self.btn_bg = "#3e8ef7"
         self.root.configure(bg=self.dark_bg)
-        self.image_cache = {}           
         self.latest_window = None       
-        self.latest_inner = None
         self.latest_canvas = None
         self.latest_scrollbar = None
+        self.headline_list = None
         self.show_btn = None
+        self.search_window = None
+        self.search_list = None
+        self.search_results = []
+        self.search_page = 0
+        self.search_seq = 0
+        self.bridge = TkBridge(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         self._build_login_frame()
+        self.bridge.submit(migrate_plaintext_passwords, key="migrate-passwords")
+
+    def close(self):
+        self.bridge.stop()
+        IMAGE_LOADER.cancel_pending()
+        self.root.destroy()
 
     def clear_root(self):
         for w in self.root.winfo_children():
@@ -242,7 +3272,8 @@ class App:
 
         btn_frame = tk.Frame(frame, bg=self.dark_bg)
         btn_frame.pack(pady=12)
-        tk.Button(btn_frame, text="Login", width=12, command=self.handle_login, bg=self.btn_bg, fg="white").pack(side="left", padx=6)
+        self.auth_btn = tk.Button(btn_frame, text="Login", width=12, command=self.handle_login, bg=self.btn_bg, fg="white")
+        self.auth_btn.pack(side="left", padx=6)
         tk.Button(btn_frame, text="Register", width=12, command=self._build_register_frame, bg="#6c757d", fg="white").pack(side="left", padx=6)
 
         tk.Label(frame, text="If first time: Register → select industries → Save", bg=self.dark_bg, fg="#bfc7cf").pack(pady=10)
@@ -262,19 +3293,41 @@ class App:
         self.reg_pass = tk.Entry(frame, show="*", bg="#3b3f44", fg=self.fg, insertbackground=self.fg)
         self.reg_pass.pack(fill="x", pady=6)
 
-        tk.Button(frame, text="Create", command=self.handle_register, bg=self.btn_bg, fg="white").pack(pady=10)
+        self.auth_btn = tk.Button(frame, text="Create", command=self.handle_register, bg=self.btn_bg, fg="white")
+        self.auth_btn.pack(pady=10)
         tk.Button(frame, text="Back to Login", command=self._build_login_frame, bg="#6c757d", fg="white").pack()
 
+    def _run_auth(self, work, done):
+        """Run `work()` (which hashes a password) off the Tk thread, then `done(result)` on it."""
+        if self.auth_btn:
+            self.auth_btn.config(state="disabled")
+
+        def failed(exc):
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+            done(None)
+        self.bridge.submit(work, on_done=done, on_error=failed, group="auth", key="auth")
+
+    def _auth_finished(self):
+        try:
+            self.auth_btn.config(state="normal")
+        except Exception:
+            pass
+
     def handle_register(self):
         u = self.reg_user.get().strip()
         p = self.reg_pass.get().strip()
         if not u or not p:
             messagebox.showerror("Error", "Enter username and password")
             return
-        ok = create_user(u, p)
-        if ok:
+        self._run_auth(lambda: SESSIONS.issue(u) if create_user(u, p) else None,
+                       lambda token: self._finish_register(u, token))
+
+    def _finish_register(self, u, token):
+        self._auth_finished()
+        if token:
             messagebox.showinfo("Success", "Account created. Please select industries.")
             self.current_user = u
+            self.session_token = token
             self._build_industry_selection(preload=[])
         else:
             messagebox.showerror("Error", "Username already exists")
@@ -285,18 +3338,31 @@ class App:
         if not u or not p:
             messagebox.showerror("Error", "Enter username and password")
             return
-        if validate_user(u, p):
+        self._run_auth(lambda: login(u, p), lambda token: self._finish_login(u, token))
+
+    def _finish_login(self, u, token):
+        self._auth_finished()
+        if token:
             self.current_user = u
+            self.session_token = token
             prefs = get_preferences(u)
             if not prefs:
                 messagebox.showinfo("Welcome", "Please select industries to follow.")
                 self._build_industry_selection(preload=[])
             else:
                 self._build_dashboard()
-                threading.Thread(target=start_scheduler, args=(u,), daemon=True).start()
+                start_scheduler(u)
         else:
             messagebox.showerror("Login failed", "Invalid username or password")
 
+    def _session_valid(self):
+        """True while the login session is live; otherwise back to the login screen."""
+        if self.current_user and SESSIONS.user(self.session_token) == self.current_user:
+            return True
+        messagebox.showinfo("Session expired", "Please log in again.")
+        self.logout(quiet=True)
+        return False
+
     def _build_industry_selection(self, preload):
         self.clear_root()
         frame = tk.Frame(self.root, bg=self.dark_bg, padx=12, pady=12)
@@ -315,14 +3381,23 @@ class App:
         tk.Button(frame, text="Cancel", command=self._build_login_frame, bg="#6c757d", fg="white").pack()
 
     def save_prefs(self):
+        if not self._session_valid():
+            return
         selected = [ind for ind, v in self.vars.items() if v.get() == 1]
         if not selected:
             messagebox.showerror("Error", "Select at least one industry")
             return
-        save_preferences(self.current_user, selected)
+        user = self.current_user
+        self.bridge.submit(save_preferences, user, selected, group="session", key="save-prefs",
+                           on_done=lambda _: self._prefs_saved(user, selected),
+                           on_error=lambda e: messagebox.showerror("Error", f"Could not save preferences: {e}"))
+
+    def _prefs_saved(self, user, selected):
+        if user != self.current_user:
+            return
         messagebox.showinfo("Saved", f"Preferences saved: {', '.join(selected)}")
         self._build_dashboard()
-        threading.Thread(target=start_scheduler, args=(self.current_user,), daemon=True).start()
+        start_scheduler(user)
 
     def _build_dashboard(self):
         self.clear_root()
@@ -335,67 +3410,142 @@ class App:
         tk.Button(frame, text="Change Preferences", command=lambda: self._build_industry_selection_with_preload(), bg="#6c757d", fg="white").pack(pady=6)
         tk.Button(frame, text="Logout", command=self.logout, bg="#6c757d", fg="white").pack(pady=6)
 
+        search = tk.Frame(frame, bg=self.dark_bg)
+        search.pack(fill="x", pady=10)
+        tk.Label(search, text="Search stored headlines", bg=self.dark_bg, fg=self.fg).pack(anchor="w")
+        self.search_entry = tk.Entry(search)
+        self.search_entry.pack(fill="x", pady=4)
+        self.search_entry.bind("<Return>", lambda e: self.run_search())
+        filters = tk.Frame(search, bg=self.dark_bg)
+        filters.pack(fill="x")
+        self.search_industry = ttk.Combobox(filters, state="readonly", width=16,
+                                            values=["All industries"] + get_preferences(self.current_user))
+        self.search_industry.current(0)
+        self.search_industry.pack(side="left")
+        self.search_period = ttk.Combobox(filters, state="readonly", width=12, values=list(SEARCH_PERIODS))
+        self.search_period.current(0)
+        self.search_period.pack(side="left", padx=6)
+        tk.Button(filters, text="Search", command=self.run_search, bg=self.btn_bg, fg="white").pack(side="left")
+
         tk.Label(frame, text=f"App will notify at {MORNING_TIME} & {EVENING_TIME}", bg=self.dark_bg, fg="#bfc7cf").pack(pady=8)
 
+    def run_search(self, page=0):
+        if not self._session_valid():
+            return
+        text = self.search_entry.get()
+        if fts_query(text) is None:
+            return
+        industry = self.search_industry.get()
+        industries = None if industry == "All industries" else [industry]
+        days = SEARCH_PERIODS[self.search_period.get()]
+        since = None
+        if days:
+            since = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)).isoformat()
+        self.search_page = page
+        # only the newest search may fill the results window
+        self.search_seq += 1
+        seq = self.search_seq
+        self.bridge.submit(search_articles, text, industries, since, None, page, group="session",
+                           on_done=lambda result: self._show_search(seq, result),
+                           on_error=self._search_failed)
+
+    def _show_search(self, seq, result):
+        if seq != self.search_seq:
+            return
+        self.search_results, more = result
+        if not (self.search_window and self.search_window.winfo_exists()):
+            self.search_window = tk.Toplevel(self.root)
+            self.search_window.title("Search Results")
+            self.search_window.geometry("700x460")
+            self.search_window.configure(bg=self.dark_bg)
+            self.search_list = tk.Listbox(self.search_window, bg=self.card_bg, fg=self.fg, activestyle="none")
+            self.search_list.pack(fill="both", expand=True, padx=8, pady=8)
+            self.search_list.bind("<Double-Button-1>", self._open_search_result)
+            nav = tk.Frame(self.search_window, bg=self.dark_bg)
+            nav.pack(fill="x", padx=8, pady=(0, 8))
+            self.search_prev = tk.Button(nav, text="< Prev", command=lambda: self.run_search(self.search_page - 1))
+            self.search_prev.pack(side="left")
+            self.search_next = tk.Button(nav, text="Next >", command=lambda: self.run_search(self.search_page + 1))
+            self.search_next.pack(side="right")
+            self.search_status = tk.Label(nav, bg=self.dark_bg, fg="#bfc7cf")
+            self.search_status.pack(side="left", expand=True)
+        self.search_list.delete(0, "end")
+        for art in self.search_results:
+            self.search_list.insert("end", f"{(art.get('publishedAt') or '')[:10]}  [{art['_industry']}]  {art.get('title') or ''}")
+        if not self.search_results:
+            self.search_list.insert("end", "No matching articles.")
+        self.search_status.config(text=f"Page {self.search_page + 1}")
+        self.search_prev.config(state="normal" if self.search_page > 0 else "disabled")
+        self.search_next.config(state="normal" if more else "disabled")
+        self.search_window.lift()
+
+    def _search_failed(self, exc):
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+        messagebox.showerror("Error", "Search failed.")
+
+    def _open_search_result(self, event):
+        sel = self.search_list.curselection()
+        if sel and sel[0] < len(self.search_results):
+            url = self.search_results[sel[0]].get("url")
+            if url:
+                webbrowser.open(url)
+
     def _build_industry_selection_with_preload(self):
         prefs = get_preferences(self.current_user)
         self._build_industry_selection(preload=prefs)
 
-    def logout(self):
+    def logout(self, quiet=False):
+        self.bridge.cancel("session")
+        if self.current_user:
+            SCHEDULER.remove_user(self.current_user)
+        SESSIONS.revoke(self.session_token)
         self.current_user = None
-        messagebox.showinfo("Logged out", "You have been logged out.")
+        self.session_token = None
+        if not quiet:
+            messagebox.showinfo("Logged out", "You have been logged out.")
         try:
             if self.latest_window and self.latest_window.winfo_exists():
-                self.latest_window.destroy()
+                self._close_latest_window()
+            if self.search_window and self.search_window.winfo_exists():
+                self.search_window.destroy()
         except Exception:
             pass
         self._build_login_frame()
 
     def show_latest_threadsafe(self):
+        if not self._session_valid():
+            return
         if self.show_btn:
             try:
                 self.show_btn.config(state="disabled")
             except Exception:
                 pass
-        threading.Thread(target=self._fetch_then_show_latest, daemon=True).start()
+        # repeated clicks while a refresh is running join that refresh
+        self.bridge.submit(fetch_latest_headlines, self.current_user, group="session", key="refresh-latest",
+                           on_done=self._show_latest, on_error=self._latest_failed)
+
+    def _show_latest(self, result):
+        self._enable_show_btn()
+        industries, all_articles = result
+        if not industries:
+            messagebox.showerror("Error", "No preferences found.")
+        elif not all_articles:
+            messagebox.showinfo("No articles", "No articles found.")
+        else:
+            self._open_or_update_latest_window(all_articles)
+
+    def _latest_failed(self, exc):
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+        self._enable_show_btn()
+        messagebox.showerror("Error", "Failed to fetch articles.")
 
-    def _fetch_then_show_latest(self):
+    def _enable_show_btn(self):
         try:
-            industries = get_preferences(self.current_user)
-            if not industries:
-                self.root.after(0, lambda: messagebox.showerror("Error", "No preferences found."))
-                return
-            all_articles = []
-            seen_urls = set()
-            for ind in industries:
-                try:
-                    arts = fetch_news_for_industry(ind, page_size=8)
-                    for a in arts:
-                        u = a.get('url')
-                        if u and u in seen_urls:
-                            continue
-                        if u:
-                            seen_urls.add(u)
-                        a["_industry"] = ind
-                        all_articles.append(a)
-                except Exception as e:
-                    print("Fetch error:", e)
-            if not all_articles:
-                self.root.after(0, lambda: messagebox.showinfo("No articles", "No articles found."))
-                return
-            try:
-                all_articles.sort(key=lambda x: x.get("publishedAt", ""), reverse=True)
-            except Exception:
-                pass
-            
-            self.root.after(0, lambda: self._open_or_update_latest_window(all_articles))
+            self.show_btn.config(state="normal")
         except Exception:
-            traceback.print_exc()
-            self.root.after(0, lambda: messagebox.showerror("Error", "Failed to fetch articles."))
-        finally:
-        
-            self.root.after(0, lambda: self.show_btn.config(state="normal") if self.show_btn else None)
+            pass
 
+    @METRICS.timed("ui_render")
     def _open_or_update_latest_window(self, articles):
         
         if not (self.latest_window and self.latest_window.winfo_exists()):
@@ -405,18 +3555,17 @@ class App:
             self.latest_window.minsize(600, 400)
             self.latest_window.configure(bg=self.dark_bg)
 
-            self.latest_canvas = tk.Canvas(self.latest_window, bg=self.dark_bg, highlightthickness=0)
+            self.latest_canvas = tk.Canvas(self.latest_window, bg=self.dark_bg, highlightthickness=0, yscrollincrement=20)
             self.latest_scrollbar = tk.Scrollbar(self.latest_window, orient="vertical", command=self.latest_canvas.yview)
-            self.latest_inner = tk.Frame(self.latest_canvas, bg=self.dark_bg)
-            self.latest_inner_id = self.latest_canvas.create_window((0,0), window=self.latest_inner, anchor='nw')
-            self.latest_canvas.configure(yscrollcommand=self.latest_scrollbar.set)
+            self.latest_canvas.configure(yscrollcommand=self._on_latest_scroll)
             self.latest_canvas.pack(side="left", fill="both", expand=True)
             self.latest_scrollbar.pack(side="right", fill="y")
+            self.latest_window.protocol("WM_DELETE_WINDOW", self._close_latest_window)
+            self.headline_list = HeadlineList(self.latest_canvas, self)
 
             def on_canvas_configure(event):
                 try:
-                    self.latest_canvas.itemconfig(self.latest_inner_id, width=event.width)
-                    self.latest_canvas.configure(scrollregion=self.latest_canvas.bbox("all"))
+                    self.headline_list.resize(event.width)
                 except Exception:
                     pass
             self.latest_canvas.bind("<Configure>", on_canvas_configure)
@@ -429,114 +3578,151 @@ class App:
             self.latest_canvas.bind_all("<MouseWheel>", _on_mousewheel)
 
         
-        for child in list(self.latest_inner.winfo_children()):
-            try:
-                child.destroy()
-            except Exception:
-                pass
-
-        
-        self.image_cache = {}
+        IMAGE_LOADER.cancel_pending()
+        self.headline_list.set_articles(articles)
 
-        
-        for art in articles:
-            card = tk.Frame(self.latest_inner, bg=self.card_bg, padx=8, pady=8)
-            card.pack(fill="x", pady=8, padx=10)
-
-            row = tk.Frame(card, bg=self.card_bg)
-            row.pack(fill="x")
-
-            
-            img_label = tk.Label(row, bg=self.card_bg)
-            img_label.pack(side="left", padx=(0,10))
-
-            img_url = art.get("urlToImage")
-            if img_url:
-                
-                threading.Thread(target=self._load_image_async, args=(img_url, img_label), daemon=True).start()
-
-            
-            text_col = tk.Frame(row, bg=self.card_bg)
-            text_col.pack(side="left", fill="both", expand=True)
-
-            title = art.get("title") or "No title"
-            url = art.get('url')
-            
-            title_lbl = tk.Label(text_col, text=title, bg=self.card_bg, fg=self.fg, font=("Arial", 12, "bold"), wraplength=760, justify="left", cursor=("hand2" if url else ""))
-            title_lbl.pack(anchor="w")
-            if url:
-                def _open(u=url):
-                    try:
-                        webbrowser.open(u)
-                    except Exception:
-                        pass
-                title_lbl.bind("<Button-1>", lambda e, u=url: _open(u))
+    def _load_image_async(self, url, card, priority=100):
+        """Queue the thumbnail on IMAGE_LOADER; it is shown on the main thread once ready."""
+        IMAGE_LOADER.submit(url, lambda u, pil: self.bridge.post(card.show_thumbnail, u, pil, group="latest"),
+                            priority=priority)
 
-                
-                def on_enter(e, lbl=title_lbl):
-                    try:
-                        lbl.configure(font=("Arial", 12, "underline"))
-                    except Exception:
-                        pass
-                def on_leave(e, lbl=title_lbl):
-                    try:
-                        lbl.configure(font=("Arial", 12, "bold"))
-                    except Exception:
-                        pass
-                title_lbl.bind("<Enter>", on_enter)
-                title_lbl.bind("<Leave>", on_leave)
-
-            summary = art.get("description") or art.get("content") or ""
-            if summary and len(summary) > 350:
-                summary = summary[:347] + "..."
-            meta = f"{art.get('_industry','')} • {art.get('source',{}).get('name','Unknown')} • {art.get('publishedAt','')[:10]}"
-            meta_lbl = tk.Label(text_col, text=meta, bg=self.card_bg, fg="#bfc7cf", font=("Arial", 9))
-            meta_lbl.pack(anchor="w", pady=(4,0))
-
-            summary_lbl = tk.Label(text_col, text=summary, bg=self.card_bg, fg=self.fg, wraplength=760, justify="left")
-            summary_lbl.pack(anchor="w", pady=(6,4))
-
-            
-            action_row = tk.Frame(text_col, bg=self.card_bg)
-            action_row.pack(fill="x")
-            if url:
-                open_btn = tk.Button(action_row, text="Open Article", bg="#5aa9ff", fg="white",
-                                     command=lambda u=url: webbrowser.open(u))
-                open_btn.pack(side="left", padx=(0,6))
-            source_lbl = tk.Label(action_row, text=art.get('source',{}).get('name',''), bg=self.card_bg, fg="#bfc7cf")
-            source_lbl.pack(side="left", padx=6)
-
-    
-        self.latest_inner.update_idletasks()
-        try:
-            self.latest_canvas.configure(scrollregion=self.latest_canvas.bbox("all"))
-        except Exception:
-            pass
+    def _on_latest_scroll(self, first, last):
+        self.latest_scrollbar.set(first, last)
+        if self.headline_list:
+            self.headline_list.refresh()
 
-    def _load_image_async(self, url, img_label):
-        """Download image in background thread, then assign to img_label on main thread."""
+    def _close_latest_window(self):
+        IMAGE_LOADER.cancel_pending()
+        self.bridge.cancel("latest")
+        self.headline_list = None
         try:
-            r = requests.get(url, timeout=8)
-            r.raise_for_status()
-            img_data = r.content
-            pil = Image.open(io.BytesIO(img_data)).convert("RGB")
-            pil.thumbnail((160, 100))
-            photo = ImageTk.PhotoImage(pil)
-            
-            def assign():
-                if img_label.winfo_exists():
-                    img_label.configure(image=photo)
-                    self.image_cache[url] = photo
-            self.root.after(0, assign)
+            self.latest_window.destroy()
         except Exception:
             pass
 
-def main():
+def run_gui():
+    _load_gui()
     init_db()
     root = tk.Tk()
     app = App(root)
     root.mainloop()
 
+
+def serve(times=(MORNING_TIME, EVENING_TIME), once=False, notify_now=False, metrics_port=None, metrics_dump=None):
+    """
+    Headless notifier: schedules every user with saved industries in DB_PATH on the
+    shared scheduler and re-reads the user list every USER_SYNC_INTERVAL seconds.
+    Never imports the GUI stack. With `metrics_port` and/or `metrics_dump` METRICS is
+    enabled and exported over HTTP and/or to a JSON file; SIGUSR1 toggles PROFILER.
+    """
+    init_db()
+    migrated = migrate_plaintext_passwords()
+    if migrated:
+        print(f"Hashed {migrated} plaintext password(s)")
+    if metrics_port is not None or metrics_dump:
+        METRICS.enabled = True
+    if metrics_port is not None:
+        server = start_metrics_server(metrics_port)
+        print(f"Metrics on http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+    if metrics_dump:
+        start_metrics_dump(metrics_dump)
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: print(f"Profiling {'on' if PROFILER.toggle() else 'off'}"))
+    if once:
+        notify_batch(subscribed_users())
+        DISPATCHER.stop(timeout=60)
+        if metrics_dump:
+            with open(metrics_dump, "w") as f:
+                json.dump(METRICS.snapshot(), f, indent=1)
+        return
+    known = set()
+
+    def sync_users():
+        current = set(subscribed_users())
+        for u in sorted(current - known):
+            SCHEDULER.add_user(u, times=times, notify_now=notify_now)
+        for u in known - current:
+            SCHEDULER.remove_user(u)
+        known.clear()
+        known.update(current)
+
+    sync_users()
+    SCHEDULER.start()
+    print(f"Serving {len(known)} users from {DB_PATH}, notifying at {', '.join(times)}")
+    try:
+        while True:
+            time.sleep(USER_SYNC_INTERVAL)
+            try:
+                sync_users()
+            except Exception as e:
+                print("User sync failed:", e)
+    except KeyboardInterrupt:
+        SCHEDULER.stop(timeout=5)
+        DISPATCHER.stop(timeout=5)
+        if PROFILER.active:
+            PROFILER.stop()
+
+
+def main(argv=None):
+    global DB_PATH, DISPATCHER, SUMMARIES, ARTICLE_RETENTION_DAYS
+    parser = argparse.ArgumentParser(description="AI Trends Notifier")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("gui", help="desktop app (default)")
+    serve_p = sub.add_parser("serve", help="headless scheduler for every user in the database")
+    serve_p.add_argument("--db", default=DB_PATH, help="users database (default: %(default)s)")
+    serve_p.add_argument("--times", nargs="+", type=notify_time, default=[MORNING_TIME, EVENING_TIME], metavar="HH:MM",
+                         help="daily notification times (default: %(default)s)")
+    serve_p.add_argument("--once", action="store_true", help="notify every user once and exit")
+    serve_p.add_argument("--now", action="store_true", help="also notify every user right after starting")
+    serve_p.add_argument("--rss", action="append", default=[], metavar="URL", help="also ingest this RSS/Atom feed")
+    serve_p.add_argument("--jsonl", action="append", default=[], metavar="PATH",
+                         help="also ingest articles from this JSON-lines file")
+    serve_p.add_argument("--no-newsapi", action="store_true", help="ingest only the --rss/--jsonl sources")
+    serve_p.add_argument("--notify-file", metavar="PATH", help="also append notifications to PATH as JSON lines")
+    serve_p.add_argument("--notify-webhook", metavar="URL", help="also POST notifications to URL as JSON")
+    serve_p.add_argument("--notify-smtp", metavar="HOST:PORT", help="also email notifications to <user>@localhost")
+    serve_p.add_argument("--no-desktop", action="store_true", help="no desktop notifications")
+    serve_p.add_argument("--notify-rate", type=float, default=NOTIFY_RATE, metavar="N",
+                         help="desktop notifications per second, 0 for no limit (default: %(default)s)")
+    serve_p.add_argument("--notify-queue", type=int, default=NOTIFY_QUEUE_SIZE, metavar="N",
+                         help="notifications queued per sink before new ones are dropped (default: %(default)s)")
+    serve_p.add_argument("--summaries", choices=["auto", "openai", "extractive", "off"], default=SUMMARY_BACKEND,
+                         help="how digest summaries are made (default: %(default)s)")
+    serve_p.add_argument("--metrics-port", type=int, metavar="PORT",
+                         help="serve Prometheus metrics on 127.0.0.1:PORT/metrics (POST /profile toggles cProfile)")
+    serve_p.add_argument("--retention-days", type=int, metavar="DAYS",
+                         help="delete stored articles published more than DAYS ago (default: keep all)")
+    serve_p.add_argument("--metrics-dump", metavar="PATH",
+                         help=f"write a JSON metrics snapshot to PATH every {METRICS_DUMP_INTERVAL}s")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        DB_PATH = args.db
+        ARTICLE_RETENTION_DAYS = args.retention_days
+        extra = [RSSSource(u) for u in args.rss] + [JSONLSource(p) for p in args.jsonl]
+        if args.no_newsapi and not extra:
+            serve_p.error("--no-newsapi needs at least one --rss or --jsonl source")
+        if extra:
+            NEWS_SOURCES[:] = ([] if args.no_newsapi else [NEWSAPI_SOURCE]) + extra
+        sinks = [] if args.no_desktop else [DesktopSink()]
+        if args.notify_file:
+            sinks.append(FileSink(args.notify_file))
+        if args.notify_webhook:
+            sinks.append(WebhookSink(args.notify_webhook))
+        if args.notify_smtp:
+            host, _, port = args.notify_smtp.rpartition(":")
+            sinks.append(EmailSink(host or "localhost", int(port)))
+        if args.notify_queue < 1:
+            serve_p.error("--notify-queue must be at least 1")
+        if not sinks:
+            serve_p.error("--no-desktop needs another sink (--notify-file, --notify-webhook or --notify-smtp)")
+        DISPATCHER = NotificationDispatcher(sinks, queue_size=args.notify_queue, rate=args.notify_rate or None)
+        SUMMARIES = SummaryService(args.summaries)
+        serve(times=tuple(args.times), once=args.once, notify_now=args.now,
+              metrics_port=args.metrics_port, metrics_dump=args.metrics_dump)
+    else:
+        run_gui()
+
 if __name__ == "__main__":
     main()
 
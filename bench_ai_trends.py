@@ -0,0 +1,1288 @@
+"""
+Benchmarks for ai_trends_notifier_step1.
+
+Runs against a local stub NewsAPI server so no API key or network is needed:
+
+    python bench_ai_trends.py            # run everything
+    python bench_ai_trends.py fetch      # run one benchmark by name
+    python bench_ai_trends.py --json results.json load   # also write results as JSON
+"""
+import io
+import heapq
+import itertools
+import json
+import os
+import random
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import ai_trends_notifier_step1 as notifier
+
+INDUSTRIES = ["Global", "Healthcare", "Finance", "Education", "Manufacturing", "IT"]
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # clients timing out on purpose close the socket mid-response
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubNewsAPI:
+    """
+    Tiny threaded HTTP server answering /v2/everything with synthetic articles.
+    A fraction `error_rate` of requests fails with `error_status` (and a Retry-After
+    header when `retry_after` is set).
+    """
+
+    def __init__(self, latency=0.25, articles_per_page=None, error_rate=0.0, error_status=503, retry_after=None,
+                 image_url=None):
+        self.latency = latency
+        self.articles_per_page = articles_per_page
+        self.image_url = image_url
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self._rng = random.Random(13)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.latency)
+                if stub._rng.random() < stub.error_rate:
+                    self.send_response(stub.error_status)
+                    if stub.retry_after is not None:
+                        self.send_header("Retry-After", str(stub.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                qs = parse_qs(urlsplit(self.path).query)
+                q = qs.get("q", [""])[0]
+                n = stub.articles_per_page or int(qs.get("pageSize", ["6"])[0])
+                body = json.dumps({"status": "ok", "articles": stub.make_articles(q, n)}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = QuietHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v2/everything"
+
+    def make_articles(self, q, n):
+        slug = q.replace(" ", "-")
+        return [
+            {
+                "title": f"{q} story {i}",
+                "description": f"Synthetic description {i} for {q}.",
+                "url": f"https://stub.local/{slug}/{i}",
+                "urlToImage": f"{self.image_url}/{slug}/{i}.jpg" if self.image_url else None,
+                "source": {"name": "Stub"},
+                "publishedAt": f"2025-01-01T{i % 24:02d}:00:00Z",
+            }
+            for i in range(n)
+        ]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self._saved = (notifier.NEWSAPI_KEY, notifier.NEWSAPI_URL)
+        notifier.NEWSAPI_KEY = "bench"
+        notifier.NEWSAPI_URL = self.url
+        return self
+
+    def __exit__(self, *exc):
+        notifier.NEWSAPI_KEY, notifier.NEWSAPI_URL = self._saved
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubImageServer:
+    """Serves the same small JPEG for every path, after `latency` seconds."""
+
+    def __init__(self, latency=0.02, size=(640, 400)):
+        from PIL import Image
+        buf = io.BytesIO()
+        Image.new("RGB", size, (40, 90, 160)).save(buf, "JPEG", quality=80)
+        self.body = buf.getvalue()
+        self.latency = latency
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = QuietHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/img"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubSMTP:
+    """Minimal SMTP server that accepts and counts every message."""
+
+    def __init__(self):
+        self.messages = 0
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.wfile.write(b"220 stub ESMTP\r\n")
+                in_data = False
+                for line in self.rfile:
+                    if in_data:
+                        if line == b".\r\n":
+                            in_data = False
+                            stub.messages += 1
+                            self.wfile.write(b"250 OK\r\n")
+                        continue
+                    verb = line[:4].upper()
+                    if verb == b"DATA":
+                        in_data = True
+                        self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    elif verb == b"QUIT":
+                        self.wfile.write(b"221 Bye\r\n")
+                        return
+                    else:
+                        self.wfile.write(b"250 OK\r\n")
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubWebhook:
+    """Accepts POSTs and counts them, after `latency` seconds."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(stub.latency)
+                stub.requests += 1
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = QuietHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class SlowSink:
+    """A notification backend that takes `delay` seconds per delivery (e.g. a hung desktop bus)."""
+
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self.name = "slow"
+
+    def send(self, username, title, message):
+        time.sleep(self.delay)
+
+
+class RecordingSink:
+    """A notification backend that only counts deliveries; `rate_limited` like DesktopSink if asked."""
+
+    def __init__(self, name="recording", rate_limited=False):
+        self.name = name
+        self.rate_limited = rate_limited
+        self.sent = 0
+
+    def send(self, username, title, message):
+        self.sent += 1
+
+
+@contextmanager
+def fresh_dispatcher(*sinks, **kw):
+    """Swap in a NotificationDispatcher over `sinks` (default: desktop); stopped afterwards."""
+    saved = notifier.DISPATCHER
+    notifier.DISPATCHER = notifier.NotificationDispatcher(list(sinks) or [notifier.DesktopSink()], **kw)
+    try:
+        yield notifier.DISPATCHER
+    finally:
+        notifier.DISPATCHER.stop(timeout=1)
+        notifier.DISPATCHER = saved
+
+
+@contextmanager
+def fresh_summaries(backend="extractive", **kw):
+    """Swap in a SummaryService over `backend` (never a real model by default); stopped afterwards."""
+    saved = notifier.SUMMARIES
+    notifier.SUMMARIES = notifier.SummaryService(backend, **kw)
+    try:
+        yield notifier.SUMMARIES
+    finally:
+        notifier.SUMMARIES.stop(timeout=5)
+        notifier.SUMMARIES = saved
+
+
+@contextmanager
+def temp_db(summaries="off"):
+    """
+    Point the notifier at a fresh, initialised database for the duration of the block.
+    Digest summaries stay off (as before they existed) unless `summaries` names a backend.
+    """
+    saved = notifier.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        notifier.DB_PATH = os.path.join(tmp, "bench.db")
+        notifier.init_db()
+        try:
+            with fresh_summaries(summaries):
+                yield notifier.DB_PATH
+        finally:
+            notifier.DB_PATH = saved
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_fetch():
+    """Wall-clock time of serial vs. concurrent multi-industry fetching."""
+    print("industries  serial(s)  parallel(s)  speedup")
+    with StubNewsAPI(latency=0.25), temp_db():
+        for n in range(1, len(INDUSTRIES) + 1):
+            inds = INDUSTRIES[:n]
+            notifier.ARTICLE_CACHE.invalidate()
+            serial = _timed(lambda: [notifier.ingest_industry(i) for i in inds])
+            notifier.ARTICLE_CACHE.invalidate()
+            parallel = _timed(lambda: notifier.refresh_industries(inds))
+            print(f"{n:>10}  {serial:>9.3f}  {parallel:>11.3f}  {serial / parallel:>6.1f}x")
+
+
+def _legacy_get_preferences(username):
+    # the pre-pooling implementation: a fresh connection per call
+    conn = notifier.sqlite3.connect(notifier.DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT industry FROM user_industries WHERE username=? ORDER BY position", (username,))
+    rows = c.fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+
+def seed_users(n, industries_per_user=3):
+    """
+    Insert `n` synthetic users with rotating industry mixes; returns their usernames.
+    `industries_per_user=None` gives each user a random 1-4 industries (seeded, so reproducible).
+    """
+    names = [f"user{i:06d}" for i in range(n)]
+    rng = random.Random(n)
+    mixes = [
+        rng.sample(INDUSTRIES, rng.randint(1, 4)) if industries_per_user is None
+        else [INDUSTRIES[(i + k) % len(INDUSTRIES)] for k in range(industries_per_user)]
+        for i in range(n)
+    ]
+    conn = notifier.get_conn()
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO users (username, password) VALUES (?, ?)",
+                         [(u, "pw") for u in names])
+        conn.executemany("REPLACE INTO user_industries (username, industry, position) VALUES (?, ?, ?)", [
+            (u, ind, k) for u, mix in zip(names, mixes) for k, ind in enumerate(mix)
+        ])
+    return names
+
+
+def bench_db(n_users=2000):
+    """Preference lookups/sec: per-call connect vs. pooled connection vs. batch query."""
+    with temp_db():
+        names = seed_users(n_users)
+        rows = [
+            ("legacy get_preferences", lambda: [_legacy_get_preferences(u) for u in names]),
+            ("pooled get_preferences", lambda: [notifier.get_preferences(u) for u in names]),
+            ("get_preferences_many", lambda: notifier.get_preferences_many(names)),
+        ]
+        print("implementation            ops/sec")
+        for label, fn in rows:
+            elapsed = _timed(fn)
+            print(f"{label:<24}  {n_users / elapsed:>9.0f}")
+
+
+class StubWidget:
+    """Stands in for Tk widgets so rendering code can be timed without a display."""
+    created = 0
+
+    def __init__(self, master=None, **kw):
+        StubWidget.created += 1
+        self.options = kw
+
+    def configure(self, **kw):
+        self.options.update(kw)
+
+    config = configure
+
+    def pack(self, **kw):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def pack_propagate(self, flag):
+        pass
+
+    def bind(self, *args):
+        pass
+
+    def winfo_exists(self):
+        return True
+
+    def destroy(self):
+        pass
+
+
+class StubCanvas(StubWidget):
+    def __init__(self, master=None, height=700, yscrollincrement=20, **kw):
+        super().__init__(master, **kw)
+        self.height = height
+        self.increment = yscrollincrement
+        self.top = 0.0
+        self.total = 0
+        self._items = 0
+
+    def configure(self, **kw):
+        super().configure(**kw)
+        if "scrollregion" in kw:
+            self.total = kw["scrollregion"][3]
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def yview_moveto(self, fraction):
+        self.top = max(0.0, min(fraction * self.total, self.total - self.height))
+
+    def yview_scroll(self, n, what):
+        self.yview_moveto((self.top + n * self.increment) / self.total if self.total else 0)
+
+    def create_window(self, *args, **kw):
+        self._items += 1
+        return self._items
+
+    def coords(self, *args):
+        pass
+
+    def itemconfigure(self, *args, **kw):
+        pass
+
+
+STUB_TK = types.SimpleNamespace(Frame=StubWidget, Label=StubWidget, Button=StubWidget, Canvas=StubCanvas)
+
+
+@contextmanager
+def stub_tk():
+    saved = notifier.tk
+    notifier.tk = STUB_TK
+    try:
+        yield
+    finally:
+        notifier.tk = saved
+
+
+def synthetic_articles(n):
+    return [
+        {
+            "title": f"Synthetic headline {i} about AI",
+            "description": "Lorem ipsum dolor sit amet " * 8,
+            "url": f"https://stub.local/article/{i}",
+            "urlToImage": None,
+            "source": {"name": "Stub"},
+            "publishedAt": "2025-01-01T00:00:00Z",
+            "_industry": INDUSTRIES[i % len(INDUSTRIES)],
+        }
+        for i in range(n)
+    ]
+
+
+def bench_headlines(sizes=(100, 1000, 10000), scroll_steps=300):
+    """Virtualized headline list: time-to-first-paint and per-scroll-step frame time (stub Tk)."""
+    app = types.SimpleNamespace(card_bg="#2f3338", fg="#f1f3f5", _load_image_async=lambda *a, **k: None)
+    print("articles  first paint(ms)  widgets  scroll avg(ms)  scroll max(ms)  full build(ms)")
+    with stub_tk():
+        for n in sizes:
+            articles = synthetic_articles(n)
+            canvas = StubCanvas()
+            headlines = notifier.HeadlineList(canvas, app)
+            headlines.resize(1000)
+            StubWidget.created = 0
+            first_paint = _timed(lambda: headlines.set_articles(articles))
+            widgets = StubWidget.created
+            frames = []
+            for _ in range(scroll_steps):
+                canvas.yview_scroll(9, "units")
+                frames.append(_timed(headlines.refresh))
+            # what the pre-virtualization window paid: a card's widgets for every article
+            full = _timed(lambda: [notifier._HeadlineCard(canvas, app) for _ in articles])
+            print(f"{n:>8}  {first_paint * 1000:>15.2f}  {widgets:>7}  {sum(frames) / len(frames) * 1000:>14.3f}"
+                  f"  {max(frames) * 1000:>14.3f}  {full * 1000:>14.1f}")
+
+
+_STARTUP_PROBE = """
+import resource, sys, time
+start = time.perf_counter()
+import ai_trends_notifier_step1 as notifier
+if sys.argv[1] == "gui":
+    notifier._load_gui()
+notifier.DB_PATH = sys.argv[2]
+notifier.init_db()
+elapsed = time.perf_counter() - start
+gui = any(m in sys.modules for m in ("tkinter", "PIL.ImageTk"))
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, gui)
+"""
+
+
+def bench_startup(runs=5):
+    """Startup time (import + init_db) and peak RSS of headless `serve` vs. GUI mode, in fresh interpreters."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    print("mode    startup(ms)  rss(MB)  gui stack loaded")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "startup.db")
+        for mode in ("serve", "gui"):
+            samples = []
+            for _ in range(runs):
+                out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE, mode, db], cwd=here,
+                                     capture_output=True, text=True, check=True).stdout.split()
+                samples.append((float(out[0]), int(out[1]), out[2]))
+            best = min(samples)
+            print(f"{mode:<6}  {best[0] * 1000:>11.1f}  {best[1] / 1024:>7.1f}  {best[2]}")
+
+
+# Labelled near-duplicate fixture: (cluster label, title, description). Articles sharing a
+# label are the same story as syndicated by different outlets; different labels are
+# distinct stories, several deliberately on the same topic.
+NEAR_DUP_FIXTURE = [
+    ("gpt", "OpenAI unveils new reasoning model for enterprise customers",
+     "OpenAI on Tuesday unveiled a new reasoning model aimed at enterprise customers, promising fewer errors on complex tasks."),
+    ("gpt", "OpenAI unveils new reasoning model for enterprise customers - Reuters",
+     "OpenAI on Tuesday unveiled a new reasoning model aimed at enterprise customers, promising fewer errors on complex tasks, the company said."),
+    ("gpt", "OpenAI unveils new reasoning model for enterprise customers | TechWire",
+     "SAN FRANCISCO - OpenAI on Tuesday unveiled a new reasoning model aimed at enterprise customers, promising fewer errors on complex tasks."),
+    ("gpt-price", "OpenAI cuts prices for its reasoning models",
+     "OpenAI said it would lower the price of its reasoning models for developers by half starting next month."),
+    ("triage", "Hospitals adopt AI triage tools to cut emergency room waits",
+     "Several hospital networks are rolling out AI triage software that ranks incoming emergency patients by urgency."),
+    ("triage", "Hospitals adopt AI triage tools to cut emergency room waits (AP)",
+     "Several hospital networks are rolling out AI triage software that ranks incoming emergency patients by urgency, officials said."),
+    ("radiology", "AI model matches radiologists at spotting lung cancer",
+     "A study found an AI model performed as well as radiologists at detecting early lung cancer on CT scans."),
+    ("radiology", "Study: AI model matches radiologists at spotting lung cancer",
+     "A study found an AI model performed as well as radiologists at detecting early lung cancer on CT scans, researchers reported."),
+    ("radiology-fda", "FDA clears AI tool that flags lung nodules on CT scans",
+     "The FDA cleared an AI tool that highlights suspicious lung nodules for radiologists reviewing CT scans."),
+    ("bank", "Major bank deploys generative AI assistant for 40,000 advisers",
+     "The bank said its generative AI assistant will help financial advisers summarize research and draft client emails."),
+    ("bank", "Major bank deploys generative AI assistant for 40,000 advisers - Bloomberg",
+     "The bank said its generative AI assistant will help financial advisers summarize research and draft client emails."),
+    ("bank-fraud", "Banks turn to AI to catch real-time payment fraud",
+     "Lenders are using machine learning models to flag suspicious instant payments before money leaves customer accounts."),
+    ("tutor", "School district pilots AI tutors in math classes",
+     "A large school district is piloting AI tutors that give students step-by-step hints on algebra homework."),
+    ("tutor", "School district pilots AI tutors in math classes, officials say",
+     "A large school district is piloting AI tutors that give students step-by-step hints on algebra homework this semester."),
+    ("exam", "Universities rethink exams as students use AI chatbots",
+     "Universities are redesigning exams and coursework as more students use AI chatbots to write essays."),
+    ("factory", "Carmaker uses AI vision to spot defects on assembly line",
+     "The carmaker said AI cameras now inspect every car body for paint and welding defects on its assembly line."),
+    ("factory", "Carmaker uses AI vision to spot defects on assembly line - WSJ",
+     "The carmaker said AI cameras now inspect every car body for paint and welding defects on its main assembly line."),
+    ("factory", "Carmaker uses AI vision to spot defects on assembly line",
+     "The carmaker said AI cameras now inspect every car body for paint and welding defects on its assembly line, cutting recalls."),
+    ("robots", "Factory robot orders hit record as AI makes automation cheaper",
+     "Orders for industrial robots reached a record as AI software makes automation cheaper for smaller factories."),
+    ("chips", "Chipmaker reports record data center revenue on AI demand",
+     "The chipmaker reported record quarterly data center revenue as demand for AI accelerators kept rising."),
+    ("chips", "Chipmaker reports record data center revenue on AI demand (update 2)",
+     "The chipmaker reported record quarterly data center revenue as demand for AI accelerators kept rising, beating estimates."),
+    ("chips-export", "New export rules restrict AI chip sales abroad",
+     "The government announced export rules limiting sales of advanced AI chips to several countries."),
+]
+
+
+def _pair_scores(labels, predicted):
+    tp = fp = fn = 0
+    for i, j in itertools.combinations(range(len(labels)), 2):
+        same, guessed = labels[i] == labels[j], predicted[i] == predicted[j]
+        tp += same and guessed
+        fp += guessed and not same
+        fn += same and not guessed
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall
+
+
+def _syndicate(base, rng):
+    words = base.split()
+    for _ in range(rng.randint(0, 2)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(["reportedly", "on", "Tuesday", "said", "new"]))
+    return " ".join(words) + rng.choice(["", " - Reuters", " (AP)", " | Wire"])
+
+
+def bench_neardup(sizes=(1000, 5000)):
+    """Near-duplicate clustering: pairwise precision/recall on the labelled fixture and per-article cost."""
+    articles = [{"title": t, "description": d} for _, t, d in NEAR_DUP_FIXTURE]
+    predicted = {}
+    for c, cluster in enumerate(notifier.cluster_articles(articles)):
+        for art in cluster:
+            predicted[id(art)] = c
+    precision, recall = _pair_scores([label for label, _, _ in NEAR_DUP_FIXTURE], [predicted[id(a)] for a in articles])
+    print(f"fixture: {len(articles)} articles, precision {precision:.2f}, recall {recall:.2f}"
+          f" (numpy: {notifier.NUMPY_AVAILABLE})")
+
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(5000)]
+    print("articles  clusters  us/article")
+    for n in sizes:
+        stories = [" ".join(rng.choice(vocab) for _ in range(30)) for _ in range(n // 5)]
+        synthetic = [{"title": _syndicate(rng.choice(stories), rng), "description": ""} for _ in range(n)]
+        clusters = []
+        elapsed = _timed(lambda: clusters.extend(notifier.cluster_articles(synthetic)))
+        print(f"{n:>8}  {len(clusters):>8}  {elapsed / n * 1e6:>10.1f}")
+
+
+def seed_articles(per_industry, industries=INDUSTRIES):
+    """Store `per_industry` synthetic articles for every industry, one minute apart."""
+    for k, ind in enumerate(industries):
+        notifier.store_articles(ind, [
+            {
+                "title": f"{ind} headline {i} w{i * 7 % 9973} w{i * 13 % 9967} w{i * 31 % 9949}",
+                "description": f"story {i} about {ind} x{i * 17 % 9931} x{i * 19 % 9929}",
+                "url": f"https://stub.local/{ind}/{i}",
+                "source": {"name": "Stub"},
+                "publishedAt": f"2025-01-{1 + i // 1440 % 28:02d}T{i // 60 % 24:02d}:{(i + k) % 60:02d}:00Z",
+            }
+            for i in range(per_industry)
+        ])
+
+
+def bench_topk(per_industry=20000, users=200):
+    """Digest selection over a large store: streaming merge + bounded heap vs. load-everything-and-sort."""
+    with temp_db():
+        seed_articles(per_industry)
+        inds = INDUSTRIES[:3]
+        conn = notifier.get_conn()
+
+        def full_sort():
+            rows = conn.execute(
+                f"SELECT * FROM articles WHERE industry IN ({','.join('?' * len(inds))})", inds).fetchall()
+            rows.sort(key=lambda r: r[7], reverse=True)
+            return rows[:notifier.NOTIFICATION_LIMIT]
+
+        scorer = notifier.make_scorer(source_weights={"Stub": 1.0})
+        print(f"{per_industry} articles/industry, {len(inds)} industries, ms per user digest")
+        for label, fn in [
+            ("materialize + full sort", full_sort),
+            ("streaming merge, recency", lambda: notifier.top_articles(inds, notifier.NOTIFICATION_LIMIT)),
+            ("streaming merge, scored", lambda: notifier.top_articles(inds, notifier.NOTIFICATION_LIMIT, score=scorer)),
+        ]:
+            n = max(1, users // 20) if label.startswith("materialize") else users
+            print(f"{label:<26}  {_timed(lambda: [fn() for _ in range(n)]) / n * 1000:>8.3f}")
+
+
+@contextmanager
+def fresh_fetcher(**kw):
+    """Swap in a new ResilientFetcher (clean breakers, quota and fallbacks) and an empty article cache."""
+    saved = notifier.NEWSAPI_FETCHER
+    notifier.NEWSAPI_FETCHER = notifier.ResilientFetcher(**kw)
+    notifier.ARTICLE_CACHE.invalidate()
+    try:
+        yield notifier.NEWSAPI_FETCHER
+    finally:
+        notifier.NEWSAPI_FETCHER = saved
+
+
+def bench_resilience(rounds=20):
+    """Fetcher behaviour against a flaky/failing/rate-limited stub NewsAPI."""
+    saved, timeout = notifier.BACKOFF_BASE, notifier.FETCH_TIMEOUT
+    notifier.BACKOFF_BASE = 0.02
+    reset = 0.5
+
+    def run(fetcher, label):
+        ok = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            try:
+                ok += bool(notifier.fetch_news_for_industry("Finance"))
+            except Exception:
+                pass
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28}  {ok:>2}/{rounds} ok  {fetcher.attempts:>3} attempts  {fetcher.fallbacks:>2} fallbacks"
+              f"  breaker {fetcher.breaker(notifier.NEWSAPI_URL).state:<9}  {elapsed:.2f}s")
+
+    try:
+        with StubNewsAPI(latency=0.02, error_rate=0.3) as stub, fresh_fetcher(breaker_reset=reset) as fetcher:
+            run(fetcher, "30% 503s, retried")
+        with StubNewsAPI(latency=0.02, error_rate=0.5, error_status=429, retry_after=0) as stub, fresh_fetcher(breaker_reset=reset) as fetcher:
+            run(fetcher, "50% 429 + Retry-After: 0")
+        with StubNewsAPI(latency=0.02) as stub, fresh_fetcher(breaker_reset=reset) as fetcher:
+            notifier.fetch_news_for_industry("Finance")
+            stub.error_rate = 1.0
+            run(fetcher, "outage after one success")
+            sent = stub.requests
+            time.sleep(reset)
+            stub.error_rate = 0.0
+            notifier.fetch_news_for_industry("Finance")
+            print(f"{'':<28}  requests while open: {stub.requests - sent - 1}, after reset breaker"
+                  f" {fetcher.breaker(notifier.NEWSAPI_URL).state}")
+        with StubNewsAPI(latency=0.02) as stub, fresh_fetcher(daily_quota=5) as fetcher:
+            run(fetcher, "daily quota of 5")
+        with StubNewsAPI(latency=0.02) as stub, fresh_fetcher(breaker_reset=reset) as fetcher:
+            notifier.fetch_news_for_industry("Finance")
+            stub.latency = 0.3
+            notifier.FETCH_TIMEOUT = (1, 0.1)
+            run(fetcher, "300ms replies, 100ms timeout")
+    finally:
+        notifier.BACKOFF_BASE = saved
+        notifier.FETCH_TIMEOUT = timeout
+
+
+def write_feeds(tmp, n):
+    """Write an n-item RSS feed and an n-line JSONL file into `tmp`; returns their paths."""
+    rss, jsonl = os.path.join(tmp, "feed.xml"), os.path.join(tmp, "feed.jsonl")
+    with open(rss, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0"?><rss version="2.0"><channel><title>Bench Feed</title>\n')
+        for i in range(n):
+            ind = INDUSTRIES[i % len(INDUSTRIES)]
+            f.write(f"<item><title>{ind} item {i}</title><link>https://feed.local/{i}</link>"
+                    f"<description>&lt;p&gt;Synthetic {ind} story {i} {'padding ' * 20}&lt;/p&gt;</description>"
+                    f"<pubDate>Wed, 01 Jan 2025 {i % 24:02d}:00:00 GMT</pubDate></item>\n")
+        f.write("</channel></rss>\n")
+    with open(jsonl, "w", encoding="utf-8") as f:
+        for i in range(n):
+            ind = INDUSTRIES[i % len(INDUSTRIES)]
+            f.write(json.dumps({"title": f"{ind} item {i}", "description": "padding " * 20,
+                                "url": f"https://jsonl.local/{i}", "source": "Bench",
+                                "publishedAt": f"2025-01-{1 + i % 28:02d}T{i % 24:02d}:00:00Z",
+                                "industries": [ind]}) + "\n")
+    return rss, jsonl
+
+
+def _peak_alloc(fn):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_sources(n=50000, page_size=8):
+    """Streaming feed adapters vs. whole-document parsing, and a mixed-source refresh cycle."""
+    with tempfile.TemporaryDirectory() as tmp:
+        rss_path, jsonl_path = write_feeds(tmp, n)
+        rss = notifier.RSSSource("https://feed.local/bench.xml")
+
+        def chunks():
+            with open(rss_path, "rb") as f:
+                yield from iter(lambda: f.read(16384), b"")
+
+        def rss_stream():
+            list(itertools.islice((a for a in rss.parse(chunks()) if notifier.matches_industry("Finance", a)), page_size))
+
+        def rss_full():
+            # a rare industry: every item is read, only the page is kept
+            list(itertools.islice((a for a in rss.parse(chunks()) if notifier.matches_industry("Robotics", a)), page_size))
+
+        def rss_tree():
+            with open(rss_path, "rb") as f:
+                notifier.ElementTree.fromstring(f.read())
+
+        def jsonl_stream():
+            notifier.ARTICLE_CACHE.invalidate()
+            notifier.JSONLSource(jsonl_path).fetch("Finance", page_size)
+
+        def jsonl_load():
+            with open(jsonl_path, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+            sorted((r for r in rows if "Finance" in r["industries"]), key=lambda r: r["publishedAt"])[-page_size:]
+
+        print(f"{n} items per feed")
+        print("case                         time(s)  peak alloc(MB)")
+        for label, fn in [("rss stream, stop at page", rss_stream), ("rss stream, whole feed", rss_full),
+                          ("rss ElementTree.fromstring", rss_tree), ("jsonl stream + nlargest", jsonl_stream),
+                          ("jsonl load all + sort", jsonl_load)]:
+            elapsed, peak = _peak_alloc(fn)
+            print(f"{label:<27}  {elapsed:>7.3f}  {peak / 1e6:>14.1f}")
+
+        with StubNewsAPI(latency=0.1), temp_db():
+            notifier.ARTICLE_CACHE.invalidate()
+            sources = [notifier.NEWSAPI_SOURCE, notifier.JSONLSource(jsonl_path)]
+            start = time.perf_counter()
+            stats = notifier.refresh_industries(INDUSTRIES, page_size, sources=sources)
+            elapsed = time.perf_counter() - start
+            print(f"\nrefresh {len(INDUSTRIES)} industries x {len(sources)} sources: {elapsed:.3f}s")
+            for name, st in sorted(stats.items()):
+                print(f"  {os.path.basename(name):<16} {st['calls']:>2} calls  {st['items']:>3} items"
+                      f"  {st['errors']} errors  {st['seconds']:.3f}s")
+
+
+def bench_metrics(users=200, rounds=5):
+    """Cost of the metrics instrumentation on a full notify cycle, disabled vs. enabled."""
+    saved_send, saved_enabled = notifier.send_notification, notifier.METRICS.enabled
+    notifier.send_notification = lambda title, message, **kw: None
+    try:
+        with StubNewsAPI(latency=0.0), temp_db(), fresh_fetcher(daily_quota=10 ** 6), fresh_dispatcher(rate=None):
+            names = seed_users(users)
+            print("metrics   cycle(ms)")
+            for enabled in (False, True, False, True):
+                notifier.METRICS.enabled = enabled
+                best = float("inf")
+                for _ in range(rounds):
+                    notifier.ARTICLE_CACHE.invalidate()
+                    best = min(best, _timed(lambda: notifier.notify_batch(names)))
+                print(f"{'on' if enabled else 'off':<8}  {best * 1000:>9.1f}")
+            snap = notifier.METRICS.snapshot()
+            print(f"{len(snap['counters'])} counters, {len(snap['histograms'])} histograms, "
+                  f"{len(notifier.METRICS.prometheus().splitlines())} exposition lines")
+    finally:
+        notifier.send_notification = saved_send
+        notifier.METRICS.enabled = saved_enabled
+        notifier.METRICS.reset()
+
+
+class PeakSampler:
+    """Samples the live thread count in the background; `peak_threads` after the block."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_threads = 0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self.peak_threads = threading.active_count()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_threads = max(self.peak_threads, threading.active_count() - 1)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _db_ops(snapshot):
+    # data-access calls plus top_articles store reads (one per digest)
+    return sum(h["count"] for name, h in snapshot["histograms"].items() if name.startswith("db{") or name == "rank")
+
+
+def load_cycle(n_users, per_user_sample=50, save_sample=500):
+    """
+    One load-test run against stub NewsAPI and image servers; returns a dict of results.
+    Meant to run in a fresh interpreter (see bench_load) so peak RSS belongs to this size.
+    """
+    import resource
+    from PIL import Image
+
+    notifier.Image = Image
+    sent = []
+    notifier.send_notification = lambda title, message, **kw: sent.append(title)
+    notifier.METRICS.enabled = True
+    result = {"users": n_users}
+    with tempfile.TemporaryDirectory() as tmp, StubImageServer() as images, \
+            StubNewsAPI(latency=0.05, image_url=images.url) as news, temp_db(), \
+            fresh_fetcher(daily_quota=10 ** 6), fresh_dispatcher(rate=None) as dispatcher:
+        notifier.THUMBNAILS = notifier.ThumbnailCache(cache_dir=os.path.join(tmp, "thumbs"))
+        result["seed_s"] = _timed(lambda: seed_users(n_users, industries_per_user=None))
+        names = notifier.subscribed_users()
+
+        # preference functions
+        sample = names[:per_user_sample]
+        result["get_preferences_per_s"] = len(sample) / _timed(lambda: [notifier.get_preferences(u) for u in sample])
+        result["get_preferences_many_s"] = _timed(lambda: notifier.get_preferences_many(names))
+        prefs = notifier.get_preferences_many(names[:save_sample])
+        result["save_preferences_per_s"] = len(prefs) / _timed(
+            lambda: [notifier.save_preferences(u, inds) for u, inds in prefs.items()])
+
+        # end-to-end notification cycle: every user in one batch
+        notifier.METRICS.reset()
+        sent.clear()
+        with PeakSampler() as threads:
+            result["cycle_s"] = _timed(lambda: notifier.notify_batch(names))
+            result["delivery_s"] = _timed(dispatcher.flush)
+        snap = notifier.METRICS.snapshot()
+        result.update({
+            "notifications": len(sent),
+            "newsapi_requests": news.requests,
+            "db_ops": _db_ops(snap),
+            "rank_calls": snap["histograms"].get("rank", {}).get("count", 0),
+            "cycle_peak_threads": threads.peak_threads,
+        })
+
+        # per-user path (what the GUI's Notify Now runs)
+        sample = names[:per_user_sample]
+        notifier.ARTICLE_CACHE.invalidate()
+        before = news.requests
+        result["gather_and_notify_per_user_s"] = _timed(lambda: [notifier.gather_and_notify(u) for u in sample]) / len(sample)
+        dispatcher.flush()
+        result["gather_and_notify_requests"] = news.requests - before
+
+        # headline window: first paint of the top articles with stub Tk, then every visible thumbnail
+        requested = set()
+
+        def load_image(url, card, priority=100):
+            requested.add(url)
+            notifier.IMAGE_LOADER.submit(url, lambda u, pil: None, priority=priority)
+
+        def images_done():
+            st = notifier.IMAGE_LOADER.stats()
+            return st["completed"] + st["failed"] >= len(requested)
+
+        app = types.SimpleNamespace(card_bg="#2f3338", fg="#f1f3f5", _load_image_async=load_image)
+        articles = notifier.top_articles(INDUSTRIES, notifier.HEADLINES_LIMIT)
+        with stub_tk():
+            canvas = StubCanvas()
+            headlines = notifier.HeadlineList(canvas, app)
+            headlines.resize(1000)
+            start = time.perf_counter()
+            headlines.set_articles(articles)
+            result["headlines_first_paint_s"] = time.perf_counter() - start
+            deadline = start + 30
+            while not images_done() and time.perf_counter() < deadline:
+                time.sleep(0.002)
+            result["headlines_images_s"] = time.perf_counter() - start
+        result["image_requests"] = images.requests
+        result["images_loaded"] = notifier.IMAGE_LOADER.stats()["completed"]
+
+        result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        result["threads_end"] = threading.active_count()
+    return result
+
+
+def bench_load(sizes=(10, 1000, 50000)):
+    """End-to-end load test at several user counts, each in a fresh interpreter."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    cols = [("users", "{:>6}"), ("cycle_s", "{:>8.2f}"), ("newsapi_requests", "{:>5}"), ("db_ops", "{:>7}"),
+            ("notifications", "{:>6}"), ("gather_and_notify_per_user_s", "{:>9.4f}"),
+            ("headlines_images_s", "{:>7.3f}"), ("peak_rss_mb", "{:>7.1f}"), ("cycle_peak_threads", "{:>4}")]
+    print(" users  cycle(s)  reqs  db ops  notifs  g&n(s)/u  imgs(s)  rss(MB)  thr")
+    for n in sizes:
+        out = subprocess.run(
+            [sys.executable, "-c", "import json, sys, bench_ai_trends as b; print(json.dumps(b.load_cycle(int(sys.argv[1]))))",
+             str(n)], cwd=here, capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        results.append(result)
+        print("  ".join(fmt.format(result[key]) for key, fmt in cols))
+    return results
+
+
+def bench_dispatch(users=500, digests_per_user=4, slow_delay=0.5):
+    """Notification dispatcher: submit throughput, coalescing and per-sink delivery latency."""
+    with tempfile.TemporaryDirectory() as tmp, StubSMTP() as smtp, StubWebhook(latency=0.002) as hook:
+        sinks = [SlowSink(slow_delay), notifier.FileSink(os.path.join(tmp, "notify.jsonl")),
+                 notifier.EmailSink("127.0.0.1", smtp.port), notifier.WebhookSink(hook.url)]
+        with fresh_dispatcher(*sinks, rate=None) as dispatcher:
+            start = time.perf_counter()
+            for r in range(digests_per_user):
+                for i in range(users):
+                    dispatcher.submit(f"user{i:06d}", f"AI Trends #{r}", "digest body " * 20)
+            submit = time.perf_counter() - start
+            drained = {}
+            while time.perf_counter() - start < 5:
+                for name, st in dispatcher.stats().items():
+                    if name not in drained and not st["queued"] and not st["in_flight"]:
+                        drained[name] = time.perf_counter() - start
+                if len(drained) == len(sinks):
+                    break
+                time.sleep(0.005)
+            print(f"{users * digests_per_user} submits in {submit * 1000:.1f} ms "
+                  f"({users * digests_per_user / submit:.0f}/s, caller never blocks)")
+            print("sink                    delivered  coalesced  queued  avg latency(ms)  p95(ms)  throughput/s")
+            for name, st in dispatcher.stats().items():
+                print(f"{name[:22]:<22}  {st['delivered']:>9}  {st['coalesced']:>9}  {st['queued']:>6}"
+                      f"  {st['latency_avg'] * 1000:>15.1f}  {st['latency_p95'] * 1000:>7.1f}"
+                      f"  {st['delivered'] / drained.get(name, time.perf_counter() - start):>12.0f}")
+            print(f"smtp messages {smtp.messages}, webhook posts {hook.requests}")
+
+    # production settings: only the desktop lane is held to NOTIFY_RATE/s
+    window = 2.0
+    desktop = RecordingSink("desktop", rate_limited=True)
+    with tempfile.TemporaryDirectory() as tmp, \
+            fresh_dispatcher(desktop, notifier.FileSink(os.path.join(tmp, "notify.jsonl"))) as dispatcher:
+        for i in range(users):
+            dispatcher.submit(f"user{i:06d}", "AI Trends", "digest body " * 20)
+        time.sleep(window)
+        print(f"\ndefault rate ({notifier.NOTIFY_RATE}/s, burst {notifier.NOTIFY_BURST}), "
+              f"{users} digests, delivered after {window:.0f} s:")
+        for name, st in dispatcher.stats().items():
+            print(f"  {name[:22]:<22}  {st['delivered']:>6}  (queued {st['queued']})")
+
+    # a slow sink must not hold up the fetch/rank cycle
+    print("\nsinks            notify_batch(ms)")
+    with StubNewsAPI(latency=0.0), temp_db(), fresh_fetcher(daily_quota=10 ** 6):
+        names = seed_users(200)
+        for label, sink in [("fast", notifier.FileSink(os.devnull)), ("slow (0.5 s)", SlowSink(slow_delay))]:
+            with fresh_dispatcher(sink, rate=None):
+                notifier.ARTICLE_CACHE.invalidate()
+                print(f"{label:<15}  {_timed(lambda: notifier.notify_batch(names)) * 1000:>16.1f}")
+
+
+@contextmanager
+def kdf_cost(kdf, cost):
+    """Temporarily switch PASSWORD_KDF and its cost (scrypt n or PBKDF2 iterations)."""
+    saved = notifier.PASSWORD_KDF, notifier.SCRYPT_N, notifier.PBKDF2_ITERATIONS
+    notifier.PASSWORD_KDF = kdf
+    if kdf == "scrypt":
+        notifier.SCRYPT_N = cost
+    else:
+        notifier.PBKDF2_ITERATIONS = cost
+    try:
+        yield
+    finally:
+        notifier.PASSWORD_KDF, notifier.SCRYPT_N, notifier.PBKDF2_ITERATIONS = saved
+
+
+def bench_login(rounds=5, migrate_users=200):
+    """Login latency per KDF cost, session-token checks, and plaintext password migration."""
+    settings = [("scrypt", 2 ** 12), ("scrypt", 2 ** 14), ("scrypt", 2 ** 15),
+                ("pbkdf2_sha256", 100_000), ("pbkdf2_sha256", 600_000)]
+    results = []
+    print("kdf             cost     login(ms)  bad pw(ms)  unknown user(ms)")
+    with temp_db():
+        for kdf, cost in settings:
+            with kdf_cost(kdf, cost):
+                user = f"{kdf}-{cost}"
+                notifier.create_user(user, "correct horse")
+                ok = min(_timed(lambda: notifier.login(user, "correct horse")) for _ in range(rounds))
+                bad = min(_timed(lambda: notifier.login(user, "wrong")) for _ in range(rounds))
+                unknown = min(_timed(lambda: notifier.login("nobody", "wrong")) for _ in range(rounds))
+            results.append({"kdf": kdf, "cost": cost, "login_s": ok, "bad_password_s": bad, "unknown_user_s": unknown})
+            print(f"{kdf:<14}  {cost:>7}  {ok * 1000:>9.1f}  {bad * 1000:>10.1f}  {unknown * 1000:>16.1f}")
+
+        token = notifier.SESSIONS.issue("user000000")
+        n = 100_000
+        per_check = _timed(lambda: [notifier.SESSIONS.user(token) for _ in range(n)]) / n
+        print(f"\nsession token check: {per_check * 1e6:.2f} us (vs. {results[1]['login_s'] * 1000:.1f} ms for a login)")
+
+        names = seed_users(migrate_users)       # plaintext rows, as written by older builds
+        startup = _timed(notifier.init_db)
+        first = _timed(lambda: notifier.login(names[0], "pw"))
+        second = _timed(lambda: notifier.login(names[0], "pw"))
+        migrate = _timed(notifier.migrate_plaintext_passwords)
+        print(f"init_db with {migrate_users} plaintext passwords: {startup * 1000:.1f} ms; "
+              f"first login (rehash) {first * 1000:.1f} ms, next {second * 1000:.1f} ms; "
+              f"background migration of the rest {migrate * 1000:.0f} ms")
+    return {"kdf": results, "session_check_s": per_check, "init_db_s": startup, "migrate_users": migrate_users,
+            "first_login_s": first, "next_login_s": second, "migrate_s": migrate}
+
+
+class FakeTkRoot:
+    """
+    Single-threaded stand-in for a Tk root's event loop: `after` callbacks run in due
+    order on the thread that calls `mainloop`, so main-thread stalls can be measured
+    without a display.
+    """
+
+    def __init__(self):
+        self._timers = []
+        self._seq = itertools.count()
+        self._cancelled = set()
+        self._lock = threading.Lock()
+        self._quit = False
+
+    def after(self, ms, fn, *args):
+        seq = next(self._seq)
+        with self._lock:
+            heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, seq, fn, args))
+        return seq
+
+    def after_cancel(self, seq):
+        self._cancelled.add(seq)
+
+    def quit(self):
+        self._quit = True
+
+    def mainloop(self, timeout=None):
+        """Run callbacks until quit() (or for at most `timeout` seconds)."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self._quit and (deadline is None or time.perf_counter() < deadline):
+            with self._lock:
+                due, seq, fn, args = self._timers[0] if self._timers else (time.perf_counter() + 0.001, None, None, ())
+                wait = due - time.perf_counter()
+                if fn is not None and wait <= 0:
+                    heapq.heappop(self._timers)
+            if fn is None or wait > 0:
+                time.sleep(max(0.0, min(wait, 0.001)))
+            elif seq not in self._cancelled:
+                fn(*args)
+
+
+def bench_tkbridge(results=3000, result_cost=0.0005, refresh_clicks=50, probe_ms=10, duration=2.0):
+    """
+    Tk-thread responsiveness under heavy background load: a 10 ms probe timer's lateness
+    while `results` thumbnails (each costing `result_cost` s of Tk time) arrive and the
+    refresh button is clicked repeatedly, with the bridge's per-tick budget vs. draining all at once.
+    """
+    print("drain            probe p50(ms)  p99(ms)  max(ms)  delivered  refreshes run  coalesced")
+    out = []
+    with StubNewsAPI(latency=0.05), temp_db(), fresh_fetcher(daily_quota=10 ** 6):
+        seed_users(1)
+        for label, budget_ms in (("8 ms budget", notifier.TK_TICK_BUDGET_MS), ("unbounded", 10 ** 6)):
+            root = FakeTkRoot()
+            bridge = notifier.TkBridge(root, budget_ms=budget_ms)
+            lateness, delivered, runs = [], [], []
+            start = time.perf_counter()
+
+            def probe(expected):
+                now = time.perf_counter()
+                lateness.append(now - expected)
+                if now - start < duration or (len(delivered) < results and now - start < 10 * duration):
+                    root.after(probe_ms, probe, now + probe_ms / 1000)
+                else:
+                    root.quit()
+
+            def show(i):
+                time.sleep(result_cost)     # stands in for PhotoImage creation
+                delivered.append(i)
+
+            def image_worker():
+                for i in range(results):
+                    bridge.post(show, i, group="latest")
+                    if i % 100 == 0:
+                        time.sleep(0.01)
+
+            def click():
+                notifier.ARTICLE_CACHE.invalidate()
+                bridge.submit(notifier.fetch_latest_headlines, "user000000", group="session", key="refresh-latest",
+                              on_done=runs.append)
+
+            root.after(probe_ms, probe, start + probe_ms / 1000)
+            for k in range(refresh_clicks):
+                root.after(k * 20, click)
+            threading.Thread(target=image_worker, daemon=True).start()
+            root.mainloop()
+            bridge.stop(wait=True)
+            lat = sorted(lateness)
+            row = {"drain": label, "probe_p50_s": lat[len(lat) // 2], "probe_p99_s": lat[int(len(lat) * 0.99)],
+                   "probe_max_s": lat[-1], "delivered": len(delivered), "refreshes": len(runs), "coalesced": bridge.coalesced}
+            out.append(row)
+            print(f"{label:<15}  {row['probe_p50_s'] * 1000:>13.1f}  {row['probe_p99_s'] * 1000:>7.1f}"
+                  f"  {row['probe_max_s'] * 1000:>7.1f}  {len(delivered):>9}  {len(runs):>13}  {bridge.coalesced:>9}")
+    return out
+
+
+SEARCH_TOPICS = ["robotics", "chatbot", "diagnostics", "fraud", "tutoring", "supply", "semiconductor", "regulation",
+                 "privacy", "startup", "funding", "quantum", "vision", "speech", "drug", "insurance"]
+
+
+def seed_articles_bulk(n, batch=50_000):
+    """
+    Insert `n` synthetic articles straight into the store (the FTS triggers index them
+    as they go). Titles mix one of SEARCH_TOPICS with Zipf-distributed filler words, so
+    search terms range from rare to very common. Returns the insert rate in rows/s.
+    """
+    rng = random.Random(20)
+    vocab = [f"w{i}" for i in range(20_000)]
+    cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(vocab))))
+    conn = notifier.get_conn()
+    elapsed = 0.0
+    for lo in range(0, n, batch):
+        rows = []
+        for i in range(lo, min(n, lo + batch)):
+            topic = SEARCH_TOPICS[i % len(SEARCH_TOPICS)]
+            words = rng.choices(vocab, cum_weights=cum_weights, k=14)
+            rows.append((f"h{i}", INDUSTRIES[i % len(INDUSTRIES)], f"https://stub.local/{i}",
+                         f"AI {topic} {' '.join(words[:6])}", " ".join(words[6:]), None, "Stub",
+                         f"20{15 + i * 10 // n:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00Z"))
+        start = time.perf_counter()
+        with conn:
+            conn.executemany("INSERT INTO articles (url_hash, industry, url, title, description, url_to_image, source,"
+                             " published_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        elapsed += time.perf_counter() - start
+    return n / elapsed
+
+
+def bench_search(n=1_000_000, repeats=5):
+    """FTS5 search latency over `n` stored articles: rare/common terms, filters and deep pages."""
+    queries = [
+        ("rare word", "w19876", {}),
+        ("topic (1/16 of rows)", "quantum", {}),
+        ("two words", "robotics w3", {}),
+        ("prefix while typing", "semicon", {}),
+        ("common word", "w1", {}),
+        ("+ industry filter", "fraud", {"industries": ["Finance", "IT"]}),
+        ("+ date filter", "fraud", {"since": "2024-01-01T00:00:00Z"}),
+        ("page 10", "chatbot", {"page": 9}),
+    ]
+    out = {"articles": n, "queries": []}
+    with temp_db() as path:
+        rate = seed_articles_bulk(n)
+        notifier.get_conn().execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+        out["insert_rows_per_s"] = rate
+        print(f"{n} articles indexed at {rate:.0f} rows/s, db {os.path.getsize(path) / 1e6:.0f} MB")
+        print("query                     matches  first page(ms)")
+        for label, text, kw in queries:
+            best = min(_timed(lambda: notifier.search_articles(text, **kw)) for _ in range(repeats))
+            matches = notifier.get_conn().execute("SELECT count(*) FROM articles_fts WHERE articles_fts MATCH ?",
+                                                  (notifier.fts_query(text),)).fetchone()[0]
+            out["queries"].append({"query": label, "text": text, "matches": matches, "seconds": best})
+            print(f"{label:<24}  {matches:>8}  {best * 1000:>14.1f}")
+    return out
+
+
+class StubSummarizer:
+    """Summary backend standing in for a model: `latency` seconds per call, whatever the batch size."""
+
+    def __init__(self, latency=0.5):
+        self.latency = latency
+        self.name = "stub"
+        self.calls = 0
+        self.articles = 0
+
+    def summarize(self, articles):
+        self.calls += 1
+        self.articles += len(articles)
+        time.sleep(self.latency)
+        return [f"Summary of {a.get('title')}" for a in articles]
+
+
+def long_descriptions(n, sentences=8):
+    rng = random.Random(n)
+    words = SEARCH_TOPICS + ["market", "model", "hospital", "bank", "students", "factory", "launch", "growth"]
+    return [
+        {"title": f"{rng.choice(SEARCH_TOPICS)} update {i}",
+         "description": " ".join(" ".join(rng.choices(words, k=rng.randint(8, 20))).capitalize() + "."
+                                 for _ in range(sentences))}
+        for i in range(n)
+    ]
+
+
+def bench_summaries(users=500, backend_latency=0.5, per_user_sample=50):
+    """
+    Digest summaries: local extractive speed, and a notify cycle with a slow model
+    backend -- digests must not wait for it, each article is summarized once however
+    many users get it, in batches of SUMMARY_BATCH, and a hung backend falls back.
+    """
+    arts = long_descriptions(2000)
+    secs = _timed(lambda: [notifier.extractive_summary(a["title"], a["description"]) for a in arts])
+    print(f"extractive: {len(arts) / secs:.0f} articles/s ({secs / len(arts) * 1e6:.0f} us each, "
+          f"{sum(len(a['description']) for a in arts) // len(arts)} chars in)")
+    out = {"extractive_per_s": len(arts) / secs}
+
+    print("\nbackend            cycle 1(ms)  cycle 2(ms)  backend calls  articles summarized  digests with summary")
+    for label, backend in [("off", "off"), ("extractive", "extractive"),
+                           (f"stub ({backend_latency} s/call)", StubSummarizer(backend_latency))]:
+        with StubNewsAPI(latency=0.0, articles_per_page=8), temp_db(), fresh_fetcher(daily_quota=10 ** 6), \
+                fresh_dispatcher(notifier.FileSink(os.devnull), rate=None), fresh_summaries(backend) as svc:
+            names = seed_users(users, industries_per_user=None)
+            first = _timed(lambda: notifier.notify_batch(names))
+            svc.flush(60)
+            notifier.ARTICLE_CACHE.invalidate()
+            second = _timed(lambda: notifier.notify_batch(names))
+            sample = names[:per_user_sample]
+            prefs = notifier.get_preferences_many(sample)
+            with_summary = sum(
+                all(notifier.SUMMARIES.lookup(notifier.top_articles(prefs[u], notifier.NOTIFICATION_LIMIT,
+                                                                    score=notifier.DIGEST_SCORER)))
+                for u in sample)
+            st = svc.stats()
+            calls = backend.calls if isinstance(backend, StubSummarizer) else st["batches"]
+            print(f"{label:<17}  {first * 1000:>11.1f}  {second * 1000:>11.1f}  {calls:>13}  {st['summarized']:>19}"
+                  f"  {with_summary:>11}/{len(sample)}")
+            out[label] = {"cycle1_ms": first * 1000, "cycle2_ms": second * 1000, "backend_calls": calls,
+                          "summarized": st["summarized"], "digests_with_summary": with_summary / len(sample)}
+
+    hung = StubSummarizer(latency=5)
+    with temp_db(), fresh_summaries(hung, timeout=0.25) as svc:
+        start = time.perf_counter()
+        svc.request(arts[:40])
+        svc.flush(30)
+        elapsed = time.perf_counter() - start
+        print(f"\nhung backend (5 s/call, 0.25 s timeout): 40 articles summarized in {elapsed:.2f} s, "
+              f"{svc.stats()['fallbacks']} by the local fallback")
+        out["hung_backend_s"] = elapsed
+    return out
+
+
+BENCHMARKS = {
+    "fetch": bench_fetch,
+    "db": bench_db,
+    "headlines": bench_headlines,
+    "startup": bench_startup,
+    "neardup": bench_neardup,
+    "topk": bench_topk,
+    "resilience": bench_resilience,
+    "sources": bench_sources,
+    "metrics": bench_metrics,
+    "load": bench_load,
+    "dispatch": bench_dispatch,
+    "login": bench_login,
+    "tkbridge": bench_tkbridge,
+    "search": bench_search,
+    "summaries": bench_summaries,
+}
+
+
+def main(argv):
+    json_path = None
+    if argv[:1] == ["--json"]:
+        json_path, argv = argv[1], argv[2:]
+    names = argv or list(BENCHMARKS)
+    results = {}
+    for name in names:
+        print(f"== {name} ==")
+        results[name] = BENCHMARKS[name]()
+        print()
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"time": time.time(), "python": sys.version.split()[0],
+                       "results": {k: v for k, v in results.items() if v is not None}}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_trends_notifier_step1 as notifier  # noqa: E402
+from bench_ai_trends import FakeTkRoot  # noqa: E402
+
+
+class FakeNewsAPI:
+    """
+    Local stand-in for /v2/everything. Each request pops the next scripted reply,
+    (status, headers) or an int status; once the script is used up every request gets 200.
+    """
+
+    def __init__(self):
+        self.script = []
+        self.requests = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests += 1
+                reply = fake.script.pop(0) if fake.script else 200
+                status, headers = reply if isinstance(reply, tuple) else (reply, {})
+                body = json.dumps({"status": "ok", "articles": [{"title": f"story {fake.requests}"}]}).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v2/everything"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_newsapi(monkeypatch):
+    monkeypatch.setattr(notifier, "BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(notifier.HOST_LIMITER, "min_interval", 0)
+    fake = FakeNewsAPI()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(notifier, "DB_PATH", str(tmp_path / "test.db"))
+    notifier.init_db()
+    yield notifier.DB_PATH
+    notifier.close_conn()
+
+
+@pytest.fixture
+def tk_bridge():
+    root = FakeTkRoot()
+    bridge = notifier.TkBridge(root)
+    yield root, bridge
+    bridge.stop(wait=True)
@@ -0,0 +1,49 @@
+import ai_trends_notifier_step1 as notifier
+
+
+def _stored(username):
+    return notifier.get_conn().execute("SELECT password FROM users WHERE username=?", (username,)).fetchone()[0]
+
+
+def _add_plaintext(username, password):
+    conn = notifier.get_conn()
+    with conn:
+        conn.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
+
+
+def test_plaintext_rows_are_rehashed_on_login_not_at_startup(temp_db):
+    _add_plaintext("alice", "hunter2")
+    notifier.init_db()
+    assert _stored("alice") == "hunter2"
+    assert not notifier.validate_user("alice", "wrong")
+    assert _stored("alice") == "hunter2"
+    assert notifier.validate_user("alice", "hunter2")
+    assert notifier._parse_hash(_stored("alice")) is not None
+    assert notifier.validate_user("alice", "hunter2")
+
+
+def test_plaintext_that_looks_like_a_hash_prefix(temp_db):
+    for pw in ("scrypt$secret", "scrypt$1$2$3$x$y", "scrypt$1$2$3$AAAA$AAAA", "pbkdf2_sha256$"):
+        _add_plaintext(pw, pw)
+        assert notifier.validate_user(pw, pw)
+        assert not notifier.validate_user(pw, "other")
+
+
+def test_hashed_round_trip(temp_db):
+    assert notifier.create_user("bob", "correct horse")
+    assert notifier.validate_user("bob", "correct horse")
+    assert not notifier.validate_user("bob", "correct horsf")
+    assert not notifier.validate_user("nobody", "correct horse")
+
+
+def test_startup_migration_hashes_plaintext_rows_in_batches(temp_db):
+    for i in range(5):
+        _add_plaintext(f"user{i}", f"pw{i}")
+    notifier.create_user("hashed", "pw")
+    before = _stored("hashed")
+    assert notifier.migrate_plaintext_passwords(batch=2) == 5
+    assert _stored("hashed") == before
+    for i in range(5):
+        assert notifier._parse_hash(_stored(f"user{i}")) is not None
+        assert notifier.validate_user(f"user{i}", f"pw{i}")
+    assert notifier.migrate_plaintext_passwords() == 0
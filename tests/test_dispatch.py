@@ -0,0 +1,50 @@
+import threading
+
+import ai_trends_notifier_step1 as notifier
+
+
+class ListSink:
+    def __init__(self, name, rate_limited=False):
+        self.name = name
+        self.rate_limited = rate_limited
+        self.sent = []
+
+    def send(self, username, title, message):
+        self.sent.append(username)
+
+
+class BlockedSink(ListSink):
+    def __init__(self, name):
+        super().__init__(name)
+        self.release = threading.Event()
+
+    def send(self, username, title, message):
+        self.release.wait(5)
+        super().send(username, title, message)
+
+
+def test_rate_limit_applies_only_to_rate_limited_sinks():
+    desktop, hook = ListSink("desktop", rate_limited=True), ListSink("hook")
+    dispatcher = notifier.NotificationDispatcher([desktop, hook], rate=1, burst=2)
+    try:
+        for i in range(10):
+            dispatcher.submit(f"user{i}", "t", "m")
+        assert dispatcher.flush(0.5) is False
+        assert len(hook.sent) == 10
+        assert len(desktop.sent) <= 4
+    finally:
+        dispatcher.stop(timeout=0)
+
+
+def test_drops_are_logged_once_per_interval(capsys):
+    sink = BlockedSink("hook")
+    dispatcher = notifier.NotificationDispatcher([sink], queue_size=2)
+    try:
+        results = [dispatcher.submit(f"user{i}", "t", "m") for i in range(10)]
+        assert results.count(False) >= 5
+        out = capsys.readouterr().out
+        assert out.count("hook queue full (2): dropped 1 notification(s)") == 1
+        assert dispatcher.stats()["hook"]["dropped"] == results.count(False)
+    finally:
+        sink.release.set()
+        dispatcher.stop(timeout=1)
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+import requests
+
+import ai_trends_notifier_step1 as notifier
+
+
+def test_retries_5xx_until_success(fake_newsapi):
+    fake_newsapi.script = [503, 502]
+    fetcher = notifier.ResilientFetcher(retries=3)
+    data = fetcher.get_json(fake_newsapi.url)
+    assert data["articles"][0]["title"] == "story 3"
+    assert fetcher.attempts == fake_newsapi.requests == 3
+
+
+def test_gives_up_after_retries(fake_newsapi):
+    fake_newsapi.script = [500] * 10
+    fetcher = notifier.ResilientFetcher(retries=2)
+    with pytest.raises(requests.HTTPError):
+        fetcher.get_json(fake_newsapi.url)
+    assert fake_newsapi.requests == 3
+
+
+def test_honours_retry_after(fake_newsapi):
+    fake_newsapi.script = [(429, {"Retry-After": "0.3"})]
+    fetcher = notifier.ResilientFetcher(retries=1)
+    start = time.monotonic()
+    fetcher.get_json(fake_newsapi.url)
+    assert time.monotonic() - start >= 0.3
+    assert fake_newsapi.requests == 2
+
+
+def test_breaker_opens_then_half_open_trial_closes_it(fake_newsapi):
+    fake_newsapi.script = [500, 500]
+    fetcher = notifier.ResilientFetcher(retries=0, breaker_failures=2, breaker_reset=0.2)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            fetcher.get_json(fake_newsapi.url)
+    breaker = fetcher.breaker(fake_newsapi.url)
+    assert breaker.state == "open"
+    with pytest.raises(notifier.CircuitOpen):
+        fetcher.get_json(fake_newsapi.url)
+    assert fake_newsapi.requests == 2
+    assert fetcher.quota.remaining() == notifier.NEWSAPI_DAILY_QUOTA - 2
+
+    time.sleep(0.25)
+    fetcher.get_json(fake_newsapi.url)
+    assert breaker.state == "closed"
+    assert fake_newsapi.requests == 3
+
+
+def test_failed_half_open_trial_reopens(fake_newsapi):
+    fake_newsapi.script = [500, 500]
+    fetcher = notifier.ResilientFetcher(retries=0, breaker_failures=1, breaker_reset=0.1)
+    with pytest.raises(requests.HTTPError):
+        fetcher.get_json(fake_newsapi.url)
+    time.sleep(0.15)
+    with pytest.raises(requests.HTTPError):
+        fetcher.get_json(fake_newsapi.url)
+    assert fetcher.breaker(fake_newsapi.url).state == "open"
+
+
+def test_spent_quota_does_not_strand_breaker_half_open(fake_newsapi):
+    fake_newsapi.script = [500]
+    fetcher = notifier.ResilientFetcher(retries=0, daily_quota=1, breaker_failures=1, breaker_reset=0)
+    with pytest.raises(requests.HTTPError):
+        fetcher.get_json(fake_newsapi.url)
+    with pytest.raises(notifier.QuotaExhausted):
+        fetcher.get_json(fake_newsapi.url)
+    breaker = fetcher.breaker(fake_newsapi.url)
+    assert breaker.state == "open"
+    assert breaker.allow()
+
+
+def test_unexpected_error_ends_half_open_trial(fake_newsapi, monkeypatch):
+    fetcher = notifier.ResilientFetcher(retries=0, breaker_failures=1, breaker_reset=0)
+    breaker = fetcher.breaker(fake_newsapi.url)
+    breaker.record_failure()
+
+    def boom(*args, **kwargs):
+        raise requests.TooManyRedirects("loop")
+    monkeypatch.setattr(fetcher.session(), "get", boom)
+    with pytest.raises(requests.TooManyRedirects):
+        fetcher.get_json(fake_newsapi.url)
+    assert breaker.state == "open"
+    assert breaker.allow()
+
+
+def test_quota_exhausted_serves_last_good_result(fake_newsapi):
+    fetcher = notifier.ResilientFetcher(daily_quota=1)
+    first = fetcher.get_json(fake_newsapi.url, cache_key="ai")
+    assert fetcher.get_json(fake_newsapi.url, cache_key="ai") == first
+    assert fetcher.fallbacks == 1
+    assert fake_newsapi.requests == 1
+    with pytest.raises(notifier.QuotaExhausted):
+        fetcher.get_json(fake_newsapi.url, cache_key="other")
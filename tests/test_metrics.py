@@ -0,0 +1,19 @@
+import json
+
+import ai_trends_notifier_step1 as notifier
+
+
+def test_mixed_label_value_types_export():
+    metrics = notifier.Metrics(enabled=True)
+    metrics.inc("http_requests", status=200)
+    metrics.inc("http_requests", status="ConnectTimeout")
+    metrics.inc("http_requests", status=200)
+    metrics.observe("fetch", 0.01, source="newsapi", attempt=1)
+    metrics.observe("fetch", 0.02, source="newsapi", attempt="retry")
+
+    text = metrics.prometheus()
+    assert 'ai_trends_http_requests_total{status="200"} 2' in text
+    assert 'ai_trends_http_requests_total{status="ConnectTimeout"} 1' in text
+    snap = json.loads(json.dumps(metrics.snapshot()))
+    assert snap["counters"]['http_requests{status="200"}'] == 2
+    assert snap["histograms"]['fetch{attempt="1",source="newsapi"}']["count"] == 1
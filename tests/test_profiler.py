@@ -0,0 +1,54 @@
+import cProfile
+import json
+
+import pytest
+
+import ai_trends_notifier_step1 as notifier
+
+
+@pytest.fixture
+def jsonl_source(tmp_path):
+    path = tmp_path / "news.jsonl"
+    path.write_text("\n".join(json.dumps({
+        "url": f"https://x/{i}", "title": f"story {i}", "industries": ["IT"],
+        "publishedAt": f"2026-10-{1 + i:02d}T00:00:00Z",
+    }) for i in range(5)))
+    return notifier.JSONLSource(str(path))
+
+
+def _stored():
+    return notifier.get_conn().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+@pytest.mark.parametrize("process_wide", [False, True])
+def test_fetching_while_profiling(temp_db, jsonl_source, tmp_path, monkeypatch, process_wide):
+    profiler = notifier.Profiler(str(tmp_path / "run.prof"), process_wide=process_wide)
+    monkeypatch.setattr(notifier, "PROFILER", profiler)
+    profiler.start()
+    try:
+        stats = notifier.refresh_industries(["IT"], sources=[jsonl_source])
+    finally:
+        profiler.stop()
+    assert stats[jsonl_source.name]["errors"] == 0
+    assert _stored() == 5
+    assert (tmp_path / "run.prof").exists()
+
+
+class _Taken(cProfile.Profile):
+    def enable(self, *args, **kwargs):
+        raise ValueError("Another profiling tool is already active")
+
+
+@pytest.mark.parametrize("process_wide", [False, True])
+def test_busy_profiler_hook_never_breaks_fetches(temp_db, jsonl_source, tmp_path, monkeypatch, process_wide):
+    monkeypatch.setattr(cProfile, "Profile", _Taken)
+    profiler = notifier.Profiler(str(tmp_path / "run.prof"), process_wide=process_wide)
+    monkeypatch.setattr(notifier, "PROFILER", profiler)
+    profiler.start()
+    for _ in range(2):
+        notifier.refresh_industries(["IT"], sources=[jsonl_source])
+        with profiler.section():
+            pass
+    profiler.stop()
+    assert _stored() == 5
+    assert not getattr(profiler._local, "busy", False)
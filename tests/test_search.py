@@ -0,0 +1,50 @@
+import datetime
+
+import ai_trends_notifier_step1 as notifier
+
+
+def _store(n, industry="IT"):
+    notifier.store_articles(industry, [
+        {"url": f"https://x/{industry}/{i}", "title": f"robots story {i}", "description": "about robots",
+         "publishedAt": f"2026-10-{1 + i % 9:02d}T00:00:00Z"}
+        for i in range(n)
+    ])
+
+
+def test_pages_come_from_one_ranking(temp_db, monkeypatch):
+    monkeypatch.setattr(notifier, "SEARCH_CANDIDATES", 25)
+    _store(60)
+    urls, page, more = [], 0, True
+    while more:
+        results, more = notifier.search_articles("robots", page=page, page_size=4)
+        urls += [a["url"] for a in results]
+        page += 1
+    assert len(urls) == len(set(urls)) == 25
+
+
+def test_filtered_window_counts_only_filtered_matches(temp_db, monkeypatch):
+    monkeypatch.setattr(notifier, "SEARCH_CANDIDATES", 10)
+    _store(10, "Finance")
+    _store(40, "IT")
+    results, more = notifier.search_articles("robots", industries=["Finance"], page_size=20)
+    assert len(results) == 10 and not more
+
+
+def test_index_survives_vacuum(temp_db):
+    _store(5)
+    conn = notifier.get_conn()
+    with conn:
+        conn.execute("DELETE FROM articles WHERE url='https://x/IT/1'")
+    conn.execute("VACUUM")
+    notifier.store_articles("IT", [{"url": "https://x/IT/3", "title": "drones", "publishedAt": "2026-10-09T00:00:00Z"}])
+    assert {a["url"] for a in notifier.search_articles("robots")[0]} == {"https://x/IT/0", "https://x/IT/2", "https://x/IT/4"}
+    assert [a["url"] for a in notifier.search_articles("drones")[0]] == ["https://x/IT/3"]
+
+
+def test_since_accepts_datetimes(temp_db):
+    _store(9)
+    since = datetime.datetime(2026, 10, 7, 2, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=3)))
+    results, _ = notifier.search_articles("robots", since=since)
+    assert sorted(a["url"] for a in results) == ["https://x/IT/6", "https://x/IT/7", "https://x/IT/8"]
+    naive = datetime.datetime(2026, 10, 8, 12, 0)
+    assert notifier.parse_published(naive) == naive.astimezone(datetime.timezone.utc)
@@ -0,0 +1,24 @@
+import json
+
+import ai_trends_notifier_step1 as notifier
+
+
+def test_jsonl_file_is_parsed_once_per_cycle(tmp_path, monkeypatch):
+    path = tmp_path / "news.jsonl"
+    path.write_text("\n".join(json.dumps({
+        "url": f"https://x/{i}", "title": f"story {i}", "source": "wire",
+        "industries": ["IT"] if i % 2 else ["Finance"],
+        "publishedAt": f"2026-10-{1 + i:02d}T00:00:00Z",
+    }) for i in range(9)) + "\nnot json\n")
+    source = notifier.JSONLSource(str(path))
+    reads = []
+    parse = source._parse
+    monkeypatch.setattr(source, "_parse", lambda: reads.append(1) or parse())
+
+    it = source.fetch("IT", 2)
+    finance = source.fetch("Finance", 10)
+    assert [a["url"] for a in it] == ["https://x/7", "https://x/5"]
+    assert [a["url"] for a in finance] == ["https://x/8", "https://x/6", "https://x/4", "https://x/2", "https://x/0"]
+    assert it[0]["source"] == {"name": "wire"} and "industries" not in it[0]
+    assert [a["url"] for a in source.fetch("IT", 5, since="2026-10-06T00:00:01Z")] == ["https://x/7"]
+    assert len(reads) == 1
@@ -0,0 +1,21 @@
+import ai_trends_notifier_step1 as notifier
+
+
+def _urls():
+    return sorted(r[0] for r in notifier.get_conn().execute("SELECT url FROM articles"))
+
+
+def test_retention_is_off_by_default(temp_db):
+    notifier.store_articles("IT", [{"url": "old", "title": "old", "publishedAt": "2001-01-01T00:00:00Z"}])
+    assert notifier.maybe_prune_articles() == 0
+    assert _urls() == ["old"]
+
+
+def test_prune_keeps_recent_and_undated_articles(temp_db):
+    notifier.store_articles("IT", [
+        {"url": "old", "title": "old", "publishedAt": "2001-01-01T00:00:00Z"},
+        {"url": "new", "title": "new", "publishedAt": "2999-01-01T00:00:00Z"},
+        {"url": "undated", "title": "undated", "publishedAt": "Mon, 99 Foo"},
+    ])
+    assert notifier.prune_articles(30) == 1
+    assert _urls() == ["new", "undated"]
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+import ai_trends_notifier_step1 as notifier
+from bench_ai_trends import StubSummarizer
+
+
+def _articles(n, prefix="t"):
+    return [{"title": f"{prefix}{i}", "description": f"Story {prefix}{i}. It has two sentences."} for i in range(n)]
+
+
+@pytest.fixture
+def service(temp_db):
+    services = []
+
+    def make(backend, **kw):
+        svc = notifier.SummaryService(backend, batch_wait=0.05, **kw)
+        services.append(svc)
+        return svc
+    yield make
+    for svc in services:
+        svc.stop(timeout=5)
+
+
+def test_articles_are_summarized_in_batches(service):
+    stub = StubSummarizer(latency=0)
+    svc = service(stub, batch=8)
+    svc.request(_articles(20))
+    assert svc.flush(5)
+    assert stub.articles == 20
+    assert stub.calls == 3
+    assert svc.lookup(_articles(2)) == ["Summary of t0", "Summary of t1"]
+
+
+def test_lookup_never_waits_and_queues_misses(service):
+    stub = StubSummarizer(latency=0.5)
+    svc = service(stub)
+    start = time.perf_counter()
+    assert svc.lookup(_articles(3)) == [None, None, None]
+    assert time.perf_counter() - start < 0.1
+    assert svc.flush(5)
+    assert svc.lookup(_articles(3)) == ["Summary of t0", "Summary of t1", "Summary of t2"]
+
+
+def test_same_text_is_summarized_once(service):
+    stub = StubSummarizer(latency=0)
+    svc = service(stub)
+    arts = _articles(5)
+    svc.request(arts)
+    svc.request([dict(a, url="https://elsewhere") for a in arts])
+    assert svc.flush(5)
+    assert stub.articles == 5
+
+    # a new service (e.g. after a restart) finds them in the summaries table
+    again = StubSummarizer(latency=0)
+    svc2 = service(again)
+    svc2.request(arts)
+    assert svc2.flush(5)
+    assert again.calls == 0
+    assert svc2.lookup(arts[:1]) == ["Summary of t0"]
+
+
+def test_slow_backend_falls_back_to_extractive(service):
+    svc = service(StubSummarizer(latency=2), timeout=0.1)
+    arts = _articles(12)
+    start = time.perf_counter()
+    svc.request(arts)
+    assert svc.flush(5)
+    assert time.perf_counter() - start < 1.5
+    assert svc.stats()["fallbacks"] == 12
+    assert svc.lookup(arts[:1]) == ["Story t0. It has two sentences."]
+
+
+def test_unavailable_backend_falls_back_for_good(service, monkeypatch):
+    def missing(kind):
+        raise ImportError("No module named 'openai'")
+    monkeypatch.setattr(notifier, "make_summary_backend", missing)
+    svc = service("openai")
+    svc.request(_articles(3))
+    assert svc.flush(5)
+    svc.request(_articles(3, prefix="u"))
+    assert svc.flush(5)
+    assert svc.backend is svc.fallback
+    assert svc.stats()["summarized"] == 6
+    assert svc.stats()["fallbacks"] == 3
+    assert None not in svc.lookup(_articles(3) + _articles(3, prefix="u"))
+
+
+def test_digest_uses_ready_summaries(service, monkeypatch):
+    svc = service(StubSummarizer(latency=0))
+    monkeypatch.setattr(notifier, "SUMMARIES", svc)
+    arts = _articles(2)
+    svc.request(arts[:1])
+    assert svc.flush(5)
+    _, message = notifier.build_digest(["IT"], arts)
+    assert message == "t0 — Summary of t0\n\nt1 — Story t1. It has two sentences."
+
+
+def test_old_summaries_are_pruned_with_articles(service):
+    svc = service(StubSummarizer(latency=0))
+    svc.request(_articles(2))
+    assert svc.flush(5)
+    conn = notifier.get_conn()
+    with conn:
+        conn.execute("UPDATE summaries SET created_at = created_at - 40 * 86400 WHERE summary = 'Summary of t0'")
+    notifier.prune_articles(30)
+    assert [r[0] for r in conn.execute("SELECT summary FROM summaries")] == ["Summary of t1"]
@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+def test_results_arrive_on_tk_thread(tk_bridge):
+    root, bridge = tk_bridge
+    seen = []
+    bridge.submit(lambda x: x * 2, 21, on_done=lambda r: (seen.append((r, threading.get_ident())), root.quit()))
+    root.mainloop(timeout=10)
+    assert seen == [(42, threading.get_ident())]
+
+
+def test_identical_keyed_submissions_coalesce(tk_bridge):
+    root, bridge = tk_bridge
+    release = threading.Event()
+    calls, done = [], []
+
+    def work(value):
+        calls.append(value)
+        release.wait(5)
+        return value
+    first = bridge.submit(work, "a", key="k", on_done=done.append)
+    second = bridge.submit(work, "a", key="k", on_done=done.append)
+    assert second is first
+    assert bridge.coalesced == 1
+    release.set()
+    root.after(200, root.quit)
+    root.mainloop(timeout=10)
+    assert calls == ["a"]
+
+
+def test_different_args_supersede_and_run_last(tk_bridge):
+    root, bridge = tk_bridge
+    release = threading.Event()
+    calls, done = [], []
+
+    def save(selection):
+        calls.append(selection)
+        if selection == ["A"]:
+            release.wait(5)
+        return selection
+    bridge.submit(save, ["A"], key="save-prefs", on_done=done.append)
+    time.sleep(0.05)
+    bridge.submit(save, ["B"], key="save-prefs", on_done=lambda r: (done.append(r), root.quit()))
+    time.sleep(0.05)
+    assert calls == [["A"]]         # the second save waits for the first
+    release.set()
+    root.mainloop(timeout=10)
+    assert calls == [["A"], ["B"]]
+    assert done == [["B"]]
+
+
+def test_cancel_drops_undelivered_results(tk_bridge):
+    root, bridge = tk_bridge
+    done = []
+    bridge.submit(time.sleep, 0.1, group="session", on_done=done.append)
+    bridge.cancel("session")
+    root.after(300, root.quit)
+    root.mainloop(timeout=10)
+    assert done == []
+
+
+def test_result_bursts_keep_the_event_loop_responsive(tk_bridge):
+    root, bridge = tk_bridge
+    cost = 0.0005
+    for _ in range(2000):
+        bridge.post(time.sleep, cost)
+    probe_ms, lateness = 10, []
+
+    def probe(due):
+        lateness.append(time.perf_counter() - due)
+        if len(lateness) >= 50:
+            root.quit()
+            return
+        root.after(probe_ms, probe, time.perf_counter() + probe_ms / 1000)
+    root.after(probe_ms, probe, time.perf_counter() + probe_ms / 1000)
+    root.mainloop(timeout=10)
+    # 2000 x 0.5 ms of Tk work is ~1 s, but no tick may spend more than its budget on it
+    assert bridge.longest_drain < bridge.budget + 0.05
+    assert max(lateness) < bridge.budget + 0.05